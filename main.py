@@ -1,71 +1,89 @@
 import sys
 from PySide6.QtWidgets import QApplication, QMainWindow
+from PySide6.QtCore import Qt, QTimer
 from modules.control import setup_control_panel
 from modules.canvas import OpenGLCanvas
 from modules.animation import AnimationManager
 from modules.export import ExportManager
+from modules.render_params import RenderParams, AnimationParameters
+from modules.signals import debounced, throttled
+from modules.config_manager import get_config
 from loguru import logger
 
 class VideoGenerator(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Video Generator")
+        self._params_cache = None
+        self._load_input_bounds()
         self.ui = setup_control_panel(self, self.get_parameters, OpenGLCanvas)
-        self.anim_manager = AnimationManager(
-            self.ui.canvas,
-            self.get_parameters,
-            self.ui.fixed_corners_check,
-            self.ui.show_points_check,
-            self.ui.show_lines_check,
-            self.ui.fill_triangles_check,
-            self.ui.main_hue_slider,
-            self.ui.main_saturation_slider,
-            self.ui.main_value_slider,
-            self.ui.brightness_range_slider,
-            self.ui.speed_slider,
-            self.ui.bg_hue_slider,
-            self.ui.bg_saturation_slider,
-            self.ui.bg_value_slider,
-            self.ui.side_points_check,
-            self.ui.transition_speed_slider,
-            self.ui.polygons_input
-        )
-        self.export_manager = ExportManager(
-            self.anim_manager,
-            self.ui.fixed_corners_check,
-            self.ui.show_points_check,
-            self.ui.show_lines_check,
-            self.ui.fill_triangles_check,
-            self.ui.main_hue_slider,
-            self.ui.main_saturation_slider,
-            self.ui.main_value_slider,
-            self.ui.brightness_range_slider,
-            self.ui.speed_slider,
-            self.ui.bg_hue_slider,
-            self.ui.bg_saturation_slider,
-            self.ui.bg_value_slider,
-            self.ui.progress_bar,
-            self.ui.side_points_check,
-            self.ui.transition_speed_slider
-        )
+        self.ui.width_input.textChanged.connect(self._invalidate_parameters)
+        self.ui.height_input.textChanged.connect(self._invalidate_parameters)
+        self.ui.fps_input.textChanged.connect(self._invalidate_parameters)
+        self.ui.duration_input.textChanged.connect(self._invalidate_parameters)
+        self.ui.points_input.textChanged.connect(self._invalidate_parameters)
+        self.ui.point_size_slider.valueChanged.connect(self._invalidate_parameters)
+        self.ui.line_width_slider.valueChanged.connect(self._invalidate_parameters)
+        self.params = RenderParams.snapshot(self.ui)
+        self.params.bind(self.ui)
+        self.ui.canvas.params = self.params
+        self.anim_manager = AnimationManager(self.ui.canvas, self.get_parameters, self.params)
+        self.export_manager = ExportManager(self.anim_manager, self.params, self.ui.progress_bar)
         self.is_animating = False
+        self._render_update_pending = False
         self.setup_connections()
-        self.anim_manager.generate_single_frame()
+        # Первый кадр генерируется после show(), когда запущен цикл событий
+        QTimer.singleShot(0, self.anim_manager.generate_single_frame)
 
     def get_parameters(self):
-        """Получение параметров анимации из UI."""
+        """Получение параметров анимации из UI (кэшируется до изменения полей ввода)."""
+        if self._params_cache is None:
+            self._params_cache = self._compute_parameters()
+        return self._params_cache
+
+    def _invalidate_parameters(self):
+        """Сброс кэша параметров при изменении полей ввода или слайдеров."""
+        self._params_cache = None
+
+    def _load_input_bounds(self):
+        """Однократное чтение границ (min, max, default) полей ввода из config.ini."""
+        config_manager = get_config()
+
+        def bounds(section, getter, min_val, max_val, default):
+            return (getter(section, 'min', min_val), getter(section, 'max', max_val),
+                    getter(section, 'default', default))
+
+        self._width_bounds = bounds('WidthInput', config_manager.get_int, 1, 3840, 1080)
+        self._height_bounds = bounds('HeightInput', config_manager.get_int, 1, 3840, 1080)
+        self._fps_bounds = bounds('FPSInput', config_manager.get_float, 1, 120, 30)
+        self._duration_bounds = bounds('DurationInput', config_manager.get_float, 0.1, 60, 5)
+        self._points_bounds = bounds('PointsInput', config_manager.get_int, 3, 1000, 50)
+        self._default_parameters = AnimationParameters(
+            self._width_bounds[2], self._height_bounds[2], self._fps_bounds[2],
+            self._duration_bounds[2], self._points_bounds[2],
+            config_manager.get_int('PointSizeSlider', 'default', 20),
+            config_manager.get_int('LineWidthSlider', 'default', 4),
+        )
+
+    @staticmethod
+    def _clamp(value, bounds):
+        """Ограничение значения диапазоном (min, max)."""
+        return min(max(value, bounds[0]), bounds[1])
+
+    def _compute_parameters(self):
+        """Чтение параметров анимации из полей ввода и слайдеров."""
         try:
-            width = int(self.ui.width_input.text())
-            height = int(self.ui.height_input.text())
-            fps = float(self.ui.fps_input.text())
-            duration = float(self.ui.duration_input.text())
-            num_points = int(self.ui.points_input.text())
+            width = self._clamp(self.ui.width_input.intValue(), self._width_bounds)
+            height = self._clamp(self.ui.height_input.intValue(), self._height_bounds)
+            fps = self._clamp(self.ui.fps_input.floatValue(), self._fps_bounds)
+            duration = self._clamp(self.ui.duration_input.floatValue(), self._duration_bounds)
+            num_points = self._clamp(self.ui.points_input.intValue(), self._points_bounds)
             point_size = self.ui.point_size_slider.value()
             line_width = self.ui.line_width_slider.value()
-            return width, height, fps, duration, num_points, point_size, line_width
+            return AnimationParameters(width, height, fps, duration, num_points, point_size, line_width)
         except ValueError as e:
-            logger.error(f"Ошибка получения параметров: {e}")
-            return 1080, 1080, 30, 5, 50, 20, 4
+            logger.error("Ошибка получения параметров, используются значения по умолчанию: {}", e)
+            return self._default_parameters
 
     def setup_connections(self):
         """Настройка соединений сигналов и слотов."""
@@ -74,57 +92,104 @@ class VideoGenerator(QMainWindow):
         self.ui.export_frame_button.clicked.connect(self.export_frame)
         self.ui.export_button.clicked.connect(self.export_animation)
 
-        self.ui.width_input.textChanged.connect(self.anim_manager.update_points_and_frame)
-        self.ui.height_input.textChanged.connect(self.anim_manager.update_points_and_frame)
-        self.ui.points_input.textChanged.connect(self.anim_manager.update_points_and_frame)
-        self.ui.fixed_corners_check.stateChanged.connect(self.anim_manager.update_points_and_frame)
-        self.ui.side_points_check.stateChanged.connect(self.anim_manager.update_points_and_frame)
-        self.ui.polygons_input.textChanged.connect(self.anim_manager.update_points_and_frame)
-
-        self.ui.show_points_check.stateChanged.connect(self.anim_manager.update_render_parameters)
-        self.ui.show_lines_check.stateChanged.connect(self.anim_manager.update_lines_alpha)
-        self.ui.fill_triangles_check.stateChanged.connect(self.anim_manager.update_triangles_alpha)
-        self.ui.brightness_range_slider.valueChanged.connect(self.anim_manager.update_render_parameters)
-        self.ui.main_hue_slider.valueChanged.connect(self.anim_manager.update_render_parameters)
-        self.ui.main_saturation_slider.valueChanged.connect(self.anim_manager.update_render_parameters)
-        self.ui.main_value_slider.valueChanged.connect(self.anim_manager.update_render_parameters)
-        self.ui.bg_hue_slider.valueChanged.connect(self.anim_manager.update_render_parameters)
-        self.ui.bg_saturation_slider.valueChanged.connect(self.anim_manager.update_render_parameters)
-        self.ui.bg_value_slider.valueChanged.connect(self.anim_manager.update_render_parameters)
-        self.ui.point_size_slider.valueChanged.connect(self.anim_manager.update_render_parameters)
-        self.ui.line_width_slider.valueChanged.connect(self.anim_manager.update_render_parameters)
-        self.ui.transition_speed_slider.valueChanged.connect(self.anim_manager.update_render_parameters)
-
-        self.ui.speed_slider.valueChanged.connect(self.anim_manager.update_velocities)
+        # Перегенерация точек (и парсинг полигонов) только после паузы во вводе, а не на каждое нажатие клавиши
+        points_update = debounced(self.anim_manager.update_points_and_frame, 250, self)
+        self.ui.width_input.textChanged.connect(points_update)
+        self.ui.height_input.textChanged.connect(points_update)
+        self.ui.points_input.textChanged.connect(points_update)
+        self.ui.polygons_input.textChanged.connect(points_update)
+
+        # Каждый чекбокс подключается ровно к одному обработчику
+        checkbox_handlers = (
+            (self.ui.fixed_corners_check, self.anim_manager.update_points_and_frame),
+            (self.ui.side_points_check, self.anim_manager.update_points_and_frame),
+            (self.ui.show_points_check, self._schedule_render_update),
+            (self.ui.show_lines_check, self.anim_manager.update_lines_alpha),
+            (self.ui.fill_triangles_check, self.anim_manager.update_triangles_alpha),
+        )
+        for check, handler in checkbox_handlers:
+            check.stateChanged.connect(handler)
+
+        # Перетаскивание слайдера порождает сотни сигналов в секунду, обновляемся не чаще ~60 Гц.
+        # Очередное соединение не выполняет обработчик внутри setValue(), и слайдер не блокируется
+        queued = Qt.ConnectionType.QueuedConnection
+        render_update = throttled(self._schedule_render_update, 16, self)
+        render_sliders = (
+            self.ui.brightness_range_slider,
+            self.ui.main_hue_slider,
+            self.ui.main_saturation_slider,
+            self.ui.main_value_slider,
+            self.ui.bg_hue_slider,
+            self.ui.bg_saturation_slider,
+            self.ui.bg_value_slider,
+            self.ui.point_size_slider,
+            self.ui.line_width_slider,
+            self.ui.transition_speed_slider,
+        )
+        for slider in render_sliders:
+            slider.valueChanged.connect(render_update, queued)
+
+        self.ui.speed_slider.valueChanged.connect(throttled(self.anim_manager.update_velocities, 16, self), queued)
+
+    def _schedule_render_update(self):
+        """Планирование одного обновления параметров отрисовки на следующей итерации цикла событий."""
+        if self._render_update_pending:
+            return
+        self._render_update_pending = True
+        QTimer.singleShot(0, self._do_render_update)
+
+    def _do_render_update(self):
+        """Выполнение запланированного обновления параметров отрисовки."""
+        self._render_update_pending = False
+        self.anim_manager.update_render_parameters()
 
     def toggle_animation(self):
         """Переключение состояния анимации (запуск/остановка)."""
         if self.is_animating:
-            self.anim_manager.stop_animation()
-            self.ui.start_stop_button.setText("Начать анимацию")
-            self.is_animating = False
+            self._ensure_stopped()
         else:
             self.anim_manager.start_animation()
-            self.ui.start_stop_button.setText("Остановить анимацию")
+            self._set_button_text("Остановить анимацию")
             self.is_animating = True
 
+    def _set_button_text(self, text):
+        """Смена надписи кнопки запуска только при её фактическом изменении."""
+        if self.ui.start_stop_button.text() != text:
+            self.ui.start_stop_button.setText(text)
+
+    def _ensure_stopped(self):
+        """Остановка анимации, если она запущена, с возвратом кнопки в исходное состояние."""
+        if not self.is_animating:
+            return
+        self.anim_manager.stop_animation()
+        self._set_button_text("Начать анимацию")
+        self.is_animating = False
+
     def export_frame(self):
         """Экспорт текущего кадра с остановкой анимации."""
-        if self.is_animating:
-            self.anim_manager.stop_animation()
-            self.ui.start_stop_button.setText("Начать анимацию")
-            self.is_animating = False
+        self._ensure_stopped()
         self.export_manager.export_frame()
 
     def export_animation(self):
         """Экспорт анимации с остановкой текущей анимации."""
-        if self.is_animating:
-            self.anim_manager.stop_animation()
-            self.ui.start_stop_button.setText("Начать анимацию")
-            self.is_animating = False
+        self._ensure_stopped()
         self.export_manager.export_animation()
 
+    def closeEvent(self, event):
+        """Завершение фонового потока расчёта кадров при закрытии окна."""
+        self.anim_manager.shutdown()
+        super().closeEvent(event)
+
+def setup_logging():
+    """Настройка уровня логирования из секции [Logging] файла config.ini."""
+    config_manager = get_config()
+    logger.remove()
+    # enqueue=True переносит форматирование и вывод записей в фоновый поток
+    logger.add(sys.stderr, level=config_manager.get_string('Logging', 'level', 'INFO'),
+               enqueue=True, backtrace=False, diagnose=False)
+
 if __name__ == "__main__":
+    setup_logging()
     app = QApplication(sys.argv)
     window = VideoGenerator()
     window.show()
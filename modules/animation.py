@@ -1,471 +1,641 @@
+import re
+import time
+from dataclasses import replace
 import numpy as np
-from scipy.spatial import Delaunay
-from modules.utils import initialize_points, get_color, initialize_triangle_colors, point_in_polygon, segment_intersects_polygon, closest_point_on_polygon
+from concurrent.futures import ThreadPoolExecutor
+from modules.triangulation import TriangulationCache
+from modules.fade import FadeTable
+from modules.config_manager import get_config
+from modules.utils import initialize_points, step_points, bounce_points, sort_simplices, simplex_keys, unique_edges, edge_keys, initialize_triangle_colors, points_in_polygon, closest_points_on_polygon, segments_cross_edges
 from loguru import logger
-from PySide6.QtCore import QTimer
+from PySide6.QtCore import Qt, QTimer
+
+# Пара координат полигона "(x, y)"
+_POINT_PATTERN = re.compile(r'\(\s*([-+0-9.eE]+)\s*,\s*([-+0-9.eE]+)\s*\)')
 
 class AnimationManager:
     """
     Управление анимацией точек с Delaunay-триангуляцией и настраиваемыми параметрами рендеринга.
     """
-    def __init__(self, canvas, get_parameters, fixed_corners_check, show_points_check,
-                 show_lines_check, fill_triangles_check, main_hue_slider,
-                 main_saturation_slider, main_value_slider, brightness_range_slider, speed_slider,
-                 bg_hue_slider, bg_saturation_slider, bg_value_slider, side_points_check,
-                 transition_speed_slider, polygons_input):
+    def __init__(self, canvas, get_parameters, params):
         """
         Инициализация менеджера анимации.
+
+        Args:
+            canvas (OpenGLCanvas): Холст для отрисовки.
+            get_parameters (callable): Получение параметров анимации из полей ввода.
+            params (RenderParams): Снимок значений чекбоксов и слайдеров.
         """
         self.canvas = canvas
         self.get_parameters = get_parameters
-        self.fixed_corners_check = fixed_corners_check
-        self.show_points_check = show_points_check
-        self.show_lines_check = show_lines_check
-        self.fill_triangles_check = fill_triangles_check
-        self.main_hue_slider = main_hue_slider
-        self.main_saturation_slider = main_saturation_slider
-        self.main_value_slider = main_value_slider
-        self.brightness_range_slider = brightness_range_slider
-        self.speed_slider = speed_slider
-        self.bg_hue_slider = bg_hue_slider
-        self.bg_saturation_slider = bg_saturation_slider
-        self.bg_value_slider = bg_value_slider
-        self.side_points_check = side_points_check
-        self.transition_speed_slider = transition_speed_slider
-        self.polygons_input = polygons_input
-        self.points = np.array([])
-        self.velocities = np.array([])
-        self.triangle_colors = {}
-        self.triangle_alphas = {}
-        self.line_alphas = {}
-        self.simplices = []
+        self.params = params
+        self._xy = None
+        self._vxy = None
+        self._store_points(np.empty((0, 2)), np.empty((0, 2)))
+        self.triangle_colors = np.empty((0, 4), dtype=np.float32)  # RGBA по строкам self.simplices
+        self.triangle_color_keys = np.empty(0, dtype=np.int64)
+        self.triangle_alphas = FadeTable()
+        self.line_alphas = FadeTable()
+        self.simplices = np.empty((0, 3), dtype=np.int32)
+        self._sorted_source = None
+        self._sorted_simplices = np.empty((0, 3), dtype=np.int64)
+        self._keyed_simplices = None
+        self._simplex_keys = np.empty(0, dtype=np.int64)
+        self._edged_simplices = None
+        self._edges = np.empty((0, 2), dtype=np.int32)
+        self._edge_keys = np.empty(0, dtype=np.int64)
         self.polygons = []
-        self.valid_edges = []  # Новый список для допустимых ребер
+        self._parsed_polygons_source = None  # (текст, высота холста) последнего парсинга
+        self._cache_polygon_edges()
+        self.valid_edges = np.empty((0, 2), dtype=np.int32)  # Допустимые рёбра (E, 2)
+        self.valid_edge_keys = np.empty(0, dtype=np.int64)  # Упакованные ключи valid_edges для line_alphas
+        self.triangulation = TriangulationCache()
+        # Частота проверки триангуляции в кадрах в секунду; между проверками симплексы переиспользуются
+        self.triangulation_rate = get_config().get_float('Triangulation', 'refresh_rate', 15)
+        self._frame_index = 0
+        self._geometry_dirty = False  # Точки сдвинулись после последней проверки триангуляции
+        self._points_layout = None  # (num_points, fixed_corners, side_points) последней инициализации
+        # Одноразовый таймер перезапускается на каждом такте по монотонным часам,
+        # поэтому медленный кадр не копит очередь срабатываний
         self.timer = QTimer()
-        self.timer.timeout.connect(self.update_frame)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self._on_timer)
+        self._frame_interval = 0.0  # Длительность кадра в секундах
+        self._next_tick = 0.0  # Момент следующего такта по time.monotonic()
+        # Кадры анимации считаются в фоновом потоке, поток GUI только публикует готовое состояние
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="frame")
+        self._pending_frame = None
+        # Два буфера координат для холста: снимок пишется в тот, который холст сейчас не отрисовывает
+        self._point_buffers = [np.empty((0, 2)), np.empty((0, 2))]
+        self._back_buffer = 0
         self.is_static_frame = False
-        self.lines_alpha = 1.0 if self.show_lines_check.isChecked() else 0.0
-        self.triangles_alpha = 1.0 if self.fill_triangles_check.isChecked() else 0.0
-        self.show_lines_check.stateChanged.connect(self.update_lines_alpha)
-        self.fill_triangles_check.stateChanged.connect(self.update_triangles_alpha)
-        self.polygons_input.textChanged.connect(self.update_points_and_frame)
+        self.lines_alpha = 1.0 if self.params.show_lines else 0.0
+        self.triangles_alpha = 1.0 if self.params.fill_triangles else 0.0
 
     def parse_polygons(self):
         """Парсинг полигонов из текстового поля с преобразованием координат Y."""
+        height = self.get_parameters().height
+        text = self.params.polygons_text
+        if (text, height) == self._parsed_polygons_source:
+            # Текст и высота холста не менялись, полигоны и кэш их рёбер остаются прежними
+            return
+        self._parsed_polygons_source = (text, height)
         self.polygons = []
-        width, height, _, _, _, _, _ = self.get_parameters()
-        text = self.polygons_input.toPlainText()
         for line in text.strip().split('\n'):
             if not line.strip():
                 continue
             try:
-                points = []
-                for coord in line.split('),'):
-                    coord = coord.strip('() ')
-                    x, y = map(float, coord.split(','))
-                    y_opengl = height - y
-                    points.append([x, y_opengl])
+                # Все пары координат строки извлекаются одним проходом регулярного выражения;
+                # остаток строки, кроме разделителей, означает ошибку формата
+                pairs = _POINT_PATTERN.findall(line)
+                if _POINT_PATTERN.sub('', line).strip(' ,\t'):
+                    raise ValueError("ожидаются пары координат вида (x, y)")
+                points = np.array(pairs, dtype=np.float64).reshape(-1, 2)
+                points[:, 1] = height - points[:, 1]
                 if len(points) >= 3:
-                    self.polygons.append(np.array(points))
+                    self.polygons.append(points)
                 else:
                     logger.warning(f"Пропущен полигон: требуется минимум 3 точки, получено {len(points)}")
             except ValueError as e:
                 logger.warning(f"Ошибка парсинга полигона: {line}, ошибка: {e}")
-        logger.info(f"Распознано {len(self.polygons)} полигонов")
+        self._cache_polygon_edges()
+        logger.debug("Распознано {} полигонов", len(self.polygons))
+
+    def _cache_polygon_edges(self):
+        """
+        Рёбра всех полигонов одним массивом, рассчитываемые один раз после парсинга.
+
+        Ребро k идёт из _polygon_edge_starts[k] в _polygon_edge_ends[k], рёбра полигона i
+        занимают строки _polygon_offsets[i]:_polygon_offsets[i + 1].
+        """
+        if self.polygons:
+            self._polygon_edge_starts = np.vstack(self.polygons)
+            self._polygon_edge_ends = np.vstack([np.roll(polygon, -1, axis=0) for polygon in self.polygons])
+        else:
+            self._polygon_edge_starts = np.empty((0, 2))
+            self._polygon_edge_ends = np.empty((0, 2))
+        direction = self._polygon_edge_ends - self._polygon_edge_starts
+        lengths = np.linalg.norm(direction, axis=1)
+        normals = np.column_stack((direction[:, 1], -direction[:, 0]))
+        # Единичные нормали для отражения скоростей; у рёбер нулевой длины нормаль нулевая
+        self._polygon_edge_normals = np.divide(normals, lengths[:, np.newaxis],
+                                               out=np.zeros_like(normals), where=lengths[:, np.newaxis] > 0)
+        self._polygon_offsets = np.cumsum([0] + [len(polygon) for polygon in self.polygons])
+        # Число вершин всех полигонов - неподвижных точек в конце массива, считается один раз после парсинга
+        self._num_polygon_points = int(self._polygon_offsets[-1])
+        # Ограничивающие прямоугольники (P, 2, 2): [i, 0] - минимум, [i, 1] - максимум вершин полигона i
+        self._polygon_bounds = np.array([(polygon.min(axis=0), polygon.max(axis=0)) for polygon in self.polygons],
+                                        dtype=np.float64).reshape(-1, 2, 2)
+
+    def _polygon_edges(self):
+        """Тройки (начала рёбер, концы рёбер, ограничивающий прямоугольник) каждого полигона из кэша."""
+        offsets = self._polygon_offsets
+        for start, stop, bounds in zip(offsets[:-1], offsets[1:], self._polygon_bounds):
+            yield self._polygon_edge_starts[start:stop], self._polygon_edge_ends[start:stop], bounds
 
     def update_lines_alpha(self):
         """Мгновенное обновление альфа-значения для линий."""
-        self.lines_alpha = 1.0 if self.show_lines_check.isChecked() else 0.0
-        self.canvas.lines_alpha = self.lines_alpha
+        self._join_frame()
+        self.lines_alpha = 1.0 if self.params.show_lines else 0.0
         self.update_render_parameters()
-        logger.debug(f"Альфа для линий: {self.lines_alpha}")
+        logger.debug("Альфа для линий: {}", self.lines_alpha)
 
     def update_triangles_alpha(self):
         """Мгновенное обновление альфа-значения для треугольников."""
-        self.triangles_alpha = 1.0 if self.fill_triangles_check.isChecked() else 0.0
-        self.canvas.triangles_alpha = self.triangles_alpha
+        self._join_frame()
+        self.triangles_alpha = 1.0 if self.params.fill_triangles else 0.0
         self.update_render_parameters()
-        logger.debug(f"Альфа для треугольников: {self.triangles_alpha}")
+        logger.debug("Альфа для треугольников: {}", self.triangles_alpha)
 
     def initialize_points(self, num_points, width, height):
         """Инициализация точек и их скоростей с учетом полигонов."""
-        logger.info(f"Инициализация {num_points} точек на холсте {width}x{height}")
+        logger.debug("Инициализация {} точек на холсте {}x{}", num_points, width, height)
         self.parse_polygons()
-        self.points, self.velocities = initialize_points(
-            num_points, width, height, self.fixed_corners_check.isChecked(),
-            self.side_points_check.isChecked(), self.get_speed()
+        self._points_layout = (num_points, self.params.fixed_corners, self.params.side_points)
+        points, velocities = initialize_points(
+            num_points, width, height, self.params.fixed_corners,
+            self.params.side_points, self.get_speed()
         )
-        # Добавляем статичные точки в вершины полигонов
-        polygon_points = []
-        polygon_velocities = []
-        for polygon in self.polygons:
-            polygon_points.extend(polygon)
-            polygon_velocities.extend([np.zeros(2)] * len(polygon))
-        if polygon_points:
-            self.points = np.vstack((self.points, np.array(polygon_points)))
-            self.velocities = np.vstack((self.velocities, np.array(polygon_velocities)))
+        # Добавляем статичные точки в вершины полигонов: начала рёбер из кэша - это все вершины подряд
+        if self._num_polygon_points > 0:
+            self._store_points(np.vstack((points, self._polygon_edge_starts)),
+                               np.vstack((velocities, np.zeros((self._num_polygon_points, 2)))))
+        else:
+            self._store_points(points, velocities)
         # Проверяем и выталкиваем точки, оказавшиеся внутри полигонов
-        self._push_points_out_of_polygons(width, height)
+        self._push_points_out_of_polygons(width, height, 4 if self.params.fixed_corners else 0,
+                                          8 if self.params.side_points else 0)
+        self._frame_index = 0
         self.update_triangulation_and_colors()
 
-    def _push_points_out_of_polygons(self, width, height):
-        """Выталкивание точек из полигонов."""
-        num_fixed = 4 if self.fixed_corners_check.isChecked() else 0
-        num_side = 8 if self.side_points_check.isChecked() else 0
-        num_polygon = sum(len(polygon) for polygon in self.polygons)
-        free_points_end = len(self.points) - num_fixed - num_side - num_polygon
+    def _store_points(self, points, velocities):
+        """
+        Сохранение точек и скоростей в float32-массивах вида структуры массивов.
+
+        Данные хранятся строками (2, N), поэтому x и y лежат непрерывно и интегрирование
+        проходит по плотной памяти. self.points и self.velocities - представления (N, 2)
+        тех же данных для кода, работающего с парами координат.
+
+        Args:
+            points (np.array): Координаты точек (N, 2).
+            velocities (np.array): Скорости точек (N, 2).
+        """
+        points = np.asarray(points, dtype=np.float32)
+        velocities = np.asarray(velocities, dtype=np.float32)
+        if self._xy is not None and self._xy.shape[1] == len(points):
+            # Число точек не изменилось: буферы переиспользуются без новых выделений памяти
+            np.copyto(self._xy, points.T)
+            np.copyto(self._vxy, velocities.T)
+        else:
+            self._xy = np.ascontiguousarray(points.T)
+            self._vxy = np.ascontiguousarray(velocities.T)
+        self.points = self._xy.T
+        self.velocities = self._vxy.T
+
+    def _push_points_out_of_polygons(self, width, height, num_fixed, num_side):
+        """
+        Выталкивание точек из полигонов.
+
+        Returns:
+            np.array: Булева маска свободных точек, оказавшихся внутри какого-либо полигона.
+        """
+        free_points_end = self._free_points_end(num_fixed, num_side)
         if free_points_end <= 0:
-            return
+            return np.zeros(0, dtype=bool)
         free_points = self.points[:free_points_end]
-        for i in range(free_points_end):
-            for polygon in self.polygons:
-                if point_in_polygon(free_points[i], polygon):
-                    closest_point = closest_point_on_polygon(free_points[i], polygon)
-                    self.points[i] = closest_point
-                    direction = closest_point - free_points[i]
-                    if np.linalg.norm(direction) > 1e-6:
-                        self.velocities[i] = -self.velocities[i]
+        was_inside = np.zeros(free_points_end, dtype=bool)
+        for edge_starts, edge_ends, bounds in self._polygon_edges():
+            # Точка вне ограничивающего прямоугольника не может лежать в полигоне,
+            # проверка луча считается одной векторной операцией только для остальных
+            candidates = np.flatnonzero(np.all((free_points >= bounds[0]) & (free_points <= bounds[1]), axis=1))
+            if len(candidates) == 0:
+                continue
+            inside = candidates[points_in_polygon(free_points[candidates], edge_starts, edge_ends)]
+            if len(inside) == 0:
+                continue
+            was_inside[inside] = True
+            closest = closest_points_on_polygon(free_points[inside], edge_starts, edge_ends)
+            moved = np.linalg.norm(closest - free_points[inside], axis=1) > 1e-6
+            free_points[inside] = closest
+            reversed_points = inside[moved]
+            self._vxy[:, reversed_points] = -self._vxy[:, reversed_points]
+        return was_inside
 
     def update_triangulation_and_colors(self):
         """Обновление триангуляции, цветов треугольников и допустимых ребер."""
         if len(self.points) == 0:
             return
-        tri = Delaunay(self.points)
-        self.simplices = tri.simplices
+        self.simplices = self.triangulation.rebuild(self.points)
+        self._geometry_dirty = False
         # Фильтрация ребер, исключая те, что пересекают полигоны
-        self.valid_edges = []
-        for simplex in self.simplices:
-            for i in range(3):
-                v0, v1 = simplex[i], simplex[(i + 1) % 3]
-                line_key = tuple(sorted([v0, v1]))
-                intersects = False
-                for polygon in self.polygons:
-                    if segment_intersects_polygon(self.points[v0], self.points[v1], polygon):
-                        intersects = True
-                        break
-                if not intersects:
-                    self.valid_edges.append((v0, v1))
+        self._update_valid_edges()
         if self.triangles_alpha > 0.0:
-            base_color = self.get_color()
-            self.triangle_colors = initialize_triangle_colors(
-                self.simplices, base_color,
-                self.brightness_range_slider.value(), {}
-            )
-            for simplex in self.simplices:
-                simplex_key = tuple(sorted(simplex))
-                if simplex_key not in self.triangle_alphas:
-                    self.triangle_alphas[simplex_key] = 1.0
+            self._update_triangle_colors(self.params, preserve=False)
+            self.triangle_alphas.ensure(self.get_simplex_keys())
         if self.lines_alpha > 0.0:
-            for edge in self.valid_edges:
-                line_key = tuple(sorted(edge))
-                if line_key not in self.line_alphas:
-                    self.line_alphas[line_key] = 1.0
-        self.canvas.triangle_colors = self.triangle_colors
-        self.canvas.triangle_alphas = self.triangle_alphas
-        self.canvas.line_alphas = self.line_alphas
-        self.canvas.simplices = self.simplices
-        self.canvas.points = self.points
-        self.canvas.polygons = self.polygons
-        self.canvas.valid_edges = self.valid_edges  # Передаем допустимые ребра в canvas
+            self.line_alphas.ensure(self.valid_edge_keys)
+        self._sync_canvas()
+
+    def _sync_canvas(self):
+        """Передача текущего состояния кадра холсту."""
+        self.canvas.set_state(**self._frame_state())
+
+    def _frame_state(self):
+        """
+        Снимок состояния кадра для холста.
+
+        Координаты копируются в буфер, который холст сейчас не использует, таблицы
+        прозрачностей - в копии, поэтому расчёт следующего кадра в фоновом потоке
+        не меняет данные, по которым идёт отрисовка. Симплексы, ключи и цвета при
+        смене топологии заменяются новыми массивами и передаются без копирования.
+
+        Returns:
+            dict: Аргументы OpenGLCanvas.set_state.
+        """
+        buffer = self._point_buffers[self._back_buffer]
+        if buffer.shape != self.points.shape or buffer.dtype != self.points.dtype:
+            buffer = np.empty(self.points.shape, dtype=self.points.dtype)
+            self._point_buffers[self._back_buffer] = buffer
+        np.copyto(buffer, self.points)
+        self._back_buffer ^= 1
+        return dict(
+            points=buffer,
+            simplices=self.simplices,
+            simplex_keys=self.get_simplex_keys(),
+            triangle_colors=self.triangle_colors,
+            triangle_alphas=self.triangle_alphas.copy(),
+            line_alphas=self.line_alphas.copy(),
+            triangles_alpha=self.triangles_alpha,
+            lines_alpha=self.lines_alpha,
+            polygons=self.polygons,
+            valid_edges=self.valid_edges,
+            valid_edge_keys=self.valid_edge_keys,
+        )
+
+    def _get_sorted_simplices(self):
+        """Симплексы с упорядоченными вершинами, общие для ключей треугольников и рёбер."""
+        if self._sorted_source is not self.simplices:
+            self._sorted_simplices = sort_simplices(self.simplices)
+            self._sorted_source = self.simplices
+        return self._sorted_simplices
+
+    def get_simplex_keys(self):
+        """Упакованные ключи текущих треугольников, пересчитываются только при смене симплексов."""
+        if self._keyed_simplices is not self.simplices:
+            self._simplex_keys = simplex_keys(self._get_sorted_simplices(), presorted=True)
+            self._keyed_simplices = self.simplices
+        return self._simplex_keys
+
+    def _update_triangle_colors(self, params, preserve=True):
+        """
+        Пересчёт массива цветов под текущие симплексы.
+
+        Args:
+            params (RenderParams): Снимок параметров с основным цветом и диапазоном яркости.
+            preserve (bool): Сохранять цвета треугольников, существовавших в прошлой триангуляции.
+        """
+        keys = self.get_simplex_keys()
+        if preserve and self.triangle_color_keys is keys:
+            return
+        previous_keys = self.triangle_color_keys if preserve else keys[:0]
+        self.triangle_colors = initialize_triangle_colors(
+            keys, params.main_rgb, params.brightness_range,
+            previous_keys, self.triangle_colors
+        )
+        self.triangle_color_keys = keys
+
+    def get_edges(self):
+        """Уникальные рёбра текущей триангуляции (E, 2), пересчитываются только при смене симплексов."""
+        if self._edged_simplices is not self.simplices:
+            self._edges = unique_edges(self._get_sorted_simplices(), presorted=True)
+            self._edge_keys = edge_keys(self._edges)
+            self._edged_simplices = self.simplices
+        return self._edges
+
+    def _update_valid_edges(self):
+        """Обновление допустимых рёбер: уникальные рёбра триангуляции, не пересекающие полигоны."""
+        self.get_edges()
+        if not self.polygons:
+            # Без полигонов рёбра зависят только от топологии и переиспользуются между кадрами
+            self.valid_edges = self._edges
+            self.valid_edge_keys = self._edge_keys
+            return
+        # Все рёбра триангуляции проверяются против всех рёбер полигонов одной векторной операцией
+        crossings = segments_cross_edges(self.points[self._edges[:, 0]], self.points[self._edges[:, 1]],
+                                         self._polygon_edge_starts, self._polygon_edge_ends,
+                                         both_directions=False)
+        valid = ~crossings.any(axis=1)
+        self.valid_edges = self._edges[valid]
+        self.valid_edge_keys = self._edge_keys[valid]
 
     def get_speed(self):
         """Получение скорости анимации."""
-        return self.speed_slider.value()
+        return self.params.speed
 
     def get_color(self):
         """Получение RGB цвета для точек и линий."""
-        return get_color(self.main_hue_slider.value(),
-                        self.main_saturation_slider.value(),
-                        self.main_value_slider.value())
+        return self.params.main_rgb
 
     def get_background_color(self):
         """Получение RGB цвета для фона."""
-        return get_color(self.bg_hue_slider.value(),
-                        self.bg_saturation_slider.value(),
-                        self.bg_value_slider.value())
+        return self.params.bg_rgb
+
+    def _free_points_end(self, num_fixed, num_side):
+        """Количество свободных точек, стоящих в начале массива перед угловыми, боковыми и точками полигонов."""
+        return len(self.points) - num_fixed - num_side - self._num_polygon_points
 
-    def _update_points(self):
-        """Обновление позиций точек на основе скоростей."""
-        self.points += self.velocities
+    def _update_points(self, width, height, num_fixed, num_side):
+        """Обновление позиций точек на основе скоростей с отражением свободных точек от границ холста."""
+        step_points(self._xy, self._vxy, width, height, max(self._free_points_end(num_fixed, num_side), 0))
+        self._geometry_dirty = True
 
     def _handle_boundary_collisions(self, width, height, num_fixed, num_side):
         """Обработка столкновений точек с границами холста и полигонами."""
         if len(self.points) == 0:
             return
-        num_polygon = sum(len(polygon) for polygon in self.polygons)
-        free_points_end = len(self.points) - num_fixed - num_side - num_polygon
+        free_points_end = self._free_points_end(num_fixed, num_side)
         if free_points_end <= 0:
             return
-        free_points = self.points[:free_points_end]
-        free_velocities = self.velocities[:free_points_end]
-
-        # Проверка границ холста
-        mask_x = (free_points[:, 0] < 0) | (free_points[:, 0] > width)
-        mask_y = (free_points[:, 1] < 0) | (free_points[:, 1] > height)
-        free_velocities[:, 0][mask_x] *= -1
-        free_velocities[:, 1][mask_y] *= -1
-
-        # Проверка столкновений с полигонами
-        for i in range(free_points_end):
-            for polygon in self.polygons:
-                if point_in_polygon(free_points[i], polygon):
-                    closest_point = closest_point_on_polygon(free_points[i], polygon)
-                    self.points[i] = closest_point
-                    direction = closest_point - free_points[i]
-                    if np.linalg.norm(direction) > 1e-6:
-                        self.velocities[i] = -self.velocities[i]
-                else:
-                    for j in range(len(polygon)):
-                        p1 = polygon[j]
-                        p2 = polygon[(j + 1) % len(polygon)]
-                        next_pos = free_points[i] + free_velocities[i]
-                        if segment_intersects_polygon(free_points[i], next_pos, [p1, p2]):
-                            normal = np.array([p2[1] - p1[1], p1[0] - p2[0]])
-                            normal = normal / np.linalg.norm(normal)
-                            self.velocities[i] = self.velocities[i] - 2 * np.dot(self.velocities[i], normal) * normal
+        # Отражение от границ холста выполнено в step_points, здесь проверяются столкновения с полигонами
+        if self.polygons:
+            free_points = self.points[:free_points_end]
+            free_velocities = self.velocities[:free_points_end]
+            # Точки внутри полигонов выталкиваются на границу, отражение от рёбер считается для остальных
+            outside = ~self._push_points_out_of_polygons(width, height, num_fixed, num_side)
+            # Пересечь ребро может только отрезок перемещения, чей прямоугольник задевает прямоугольник полигона
+            ends = free_points + free_velocities
+            lower = np.minimum(free_points, ends)
+            upper = np.maximum(free_points, ends)
+            bounds = self._polygon_bounds
+            near = np.all((lower[:, np.newaxis] <= bounds[:, 1]) & (upper[:, np.newaxis] >= bounds[:, 0]), axis=2)
+            candidates = np.flatnonzero(near.any(axis=1) & outside)
+            hits = segments_cross_edges(free_points[candidates], ends[candidates],
+                                        self._polygon_edge_starts, self._polygon_edge_ends)
+            hit_rows = np.flatnonzero(hits.any(axis=1))
+            hit_points = candidates[hit_rows]
+            if len(hit_points) > 0:
+                # Для каждой точки берётся первое пересечённое ребро, отражение применяется одним индексированием
+                normals = self._polygon_edge_normals[np.argmax(hits[hit_rows], axis=1)]
+                velocities = free_velocities[hit_points]
+                projections = np.einsum('ij,ij->i', velocities, normals)
+                free_velocities[hit_points] = velocities - 2 * projections[:, np.newaxis] * normals
 
         if num_side > 0:
-            side_idx = len(self.points) - num_side - num_polygon
-            for i in [side_idx, side_idx + 1, side_idx + 2, side_idx + 3]:
-                if self.points[i, 0] < 0 or self.points[i, 0] > width:
-                    self.velocities[i, 0] *= -1
-            for i in [side_idx + 4, side_idx + 5, side_idx + 6, side_idx + 7]:
-                if self.points[i, 1] < 0 or self.points[i, 1] > height:
-                    self.velocities[i, 1] *= -1
+            # Боковые точки лежат на сторонах холста и выходят за них только вдоль своей стороны,
+            # поэтому отражение по обеим осям меняет лишь компоненту скорости вдоль стороны
+            side = slice(free_points_end + num_fixed, free_points_end + num_fixed + 8)
+            bounce_points(self._xy[:, side], self._vxy[:, side], width, height)
 
     def update_frame(self, for_export=False):
-        """Обновление кадра анимации."""
+        """Синхронное обновление кадра анимации (используется экспортом)."""
         if self.is_static_frame and not for_export:
             return
-        width, height, fps, _, num_points, point_size, line_width = self.get_parameters()
-        num_fixed = 4 if self.fixed_corners_check.isChecked() else 0
-        num_side = 8 if self.side_points_check.isChecked() else 0
-        transition_speed = self.transition_speed_slider.value() / 10.0
+        self._join_frame()
+        self._advance_frame(self.get_parameters(), self.params)
+        self._sync_canvas()
+        if not for_export:
+            # Смену треугольников, рёбер или цветов холст обнаруживает сам в set_state
+            self.canvas.mark_dirty(positions_only=True)
+
+    def _start_timer(self, fps):
+        """
+        Запуск тактов анимации с частотой fps.
 
-        self._update_points()
+        Args:
+            fps (float): Частота кадров.
+        """
+        self._frame_interval = 1.0 / fps
+        self._next_tick = time.monotonic() + self._frame_interval
+        self.timer.start(round(self._frame_interval * 1000))
+
+    def _schedule_next_tick(self):
+        """Планирование следующего такта по сетке кадров; пропущенные такты не догоняются."""
+        now = time.monotonic()
+        self._next_tick += self._frame_interval
+        if self._next_tick <= now:
+            missed = int((now - self._next_tick) / self._frame_interval) + 1
+            self._next_tick += missed * self._frame_interval
+        self.timer.start(max(0, round((self._next_tick - now) * 1000)))
+
+    def _on_timer(self):
+        """Такт таймера: публикация посчитанного кадра и запуск расчёта следующего в фоновом потоке."""
+        if self.is_static_frame:
+            return
+        self._schedule_next_tick()
+        if self._pending_frame is not None:
+            if not self._pending_frame.done():
+                # Прошлый кадр ещё считается, такт пропускается вместо накопления очереди
+                return
+            self._join_frame()
+        # Параметры читаются в потоке GUI и передаются расчёту копией: обработчики сигналов
+        # меняют общий снимок self.params, пока фоновый поток считает кадр
+        self._pending_frame = self._executor.submit(self._compute_frame, self.get_parameters(),
+                                                    replace(self.params))
+
+    def _compute_frame(self, parameters, params):
+        """Расчёт кадра в фоновом потоке, возвращает снимок состояния для холста."""
+        self._advance_frame(parameters, params)
+        return self._frame_state()
+
+    def _join_frame(self):
+        """
+        Ожидание кадра, считающегося в фоновом потоке, и его публикация.
+
+        Вызывается перед любым изменением точек, триангуляции и прозрачностей из потока GUI.
+        Значения виджетов фоновый расчёт читает только из копии, снятой при запуске кадра.
+        """
+        if self._pending_frame is None:
+            return
+        frame, self._pending_frame = self._pending_frame, None
+        self.canvas.set_state(**frame.result())
+        self.canvas.mark_dirty(positions_only=True)
+
+    def _advance_frame(self, parameters, params):
+        """
+        Расчёт следующего кадра: движение точек, триангуляция, цвета и прозрачности.
+
+        Args:
+            parameters (AnimationParameters): Параметры анимации из полей ввода.
+            params (RenderParams): Снимок значений чекбоксов и слайдеров; из фонового потока
+                передаётся копия, а не общий объект self.params.
+        """
+        width, height, fps = parameters.width, parameters.height, parameters.fps
+        num_fixed = 4 if params.fixed_corners else 0
+        num_side = 8 if params.side_points else 0
+        delta = params.transition_speed / 10.0 / fps
+
+        self._update_points(width, height, num_fixed, num_side)
         self._handle_boundary_collisions(width, height, num_fixed, num_side)
-        tri = Delaunay(self.points)
-        new_simplices = tri.simplices
+        previous_simplices = self.simplices
+        refresh_every = max(1, int(fps / self.triangulation_rate)) if self.triangulation_rate > 0 else 1
+        if self._frame_index % refresh_every == 0 or len(self.simplices) == 0:
+            new_simplices = self.triangulation.update(self.points)
+            self._geometry_dirty = False
+        else:
+            # Смещение точек между проверками мало, прежние индексы отрисовываются по новым координатам
+            new_simplices = self.simplices
+        self._frame_index += 1
         self.simplices = new_simplices
         # Обновляем допустимые ребра
-        self.valid_edges = []
-        for simplex in new_simplices:
-            for i in range(3):
-                v0, v1 = simplex[i], simplex[(i + 1) % 3]
-                intersects = False
-                for polygon in self.polygons:
-                    if segment_intersects_polygon(self.points[v0], self.points[v1], polygon):
-                        intersects = True
-                        break
-                if not intersects:
-                    self.valid_edges.append((v0, v1))
-        new_simplex_keys = set(tuple(sorted(simplex)) for simplex in new_simplices)
-        old_simplex_keys = set(self.triangle_alphas.keys())
-        new_line_keys = set(tuple(sorted(edge)) for edge in self.valid_edges)
+        self._update_valid_edges()
 
         if self.triangles_alpha > 0.0:
-            base_color = self.get_color()
-            self.triangle_colors = initialize_triangle_colors(
-                new_simplices, base_color,
-                self.brightness_range_slider.value(), self.triangle_colors
-            )
-            delta = transition_speed * (1.0 / fps)
-            for simplex_key in new_simplex_keys - old_simplex_keys:
-                self.triangle_alphas[simplex_key] = 0.0
-            for simplex_key in list(self.triangle_alphas.keys()):
-                if simplex_key in new_simplex_keys:
-                    self.triangle_alphas[simplex_key] = min(self.triangle_alphas[simplex_key] + delta, 1.0)
-                else:
-                    self.triangle_alphas[simplex_key] = max(self.triangle_alphas[simplex_key] - delta, 0.0)
-                    if self.triangle_alphas[simplex_key] <= 0.01:
-                        del self.triangle_alphas[simplex_key]
-                        if simplex_key in self.triangle_colors:
-                            del self.triangle_colors[simplex_key]
-
+            if new_simplices is not previous_simplices:
+                # Цвета существующих треугольников не меняются, новые появляются только со сменой топологии
+                self._update_triangle_colors(params)
+            self.triangle_alphas.fade(self.get_simplex_keys(), delta)
         if self.lines_alpha > 0.0:
-            delta = transition_speed * (1.0 / fps)
-            for line_key in new_line_keys:
-                if line_key not in self.line_alphas:
-                    self.line_alphas[line_key] = 0.0
-            for line_key in list(self.line_alphas.keys()):
-                if line_key in new_line_keys:
-                    self.line_alphas[line_key] = min(self.line_alphas[line_key] + delta, 1.0)
-                else:
-                    self.line_alphas[line_key] = max(self.line_alphas[line_key] - delta, 0.0)
-                    if self.line_alphas[line_key] <= 0.01:
-                        del self.line_alphas[line_key]
-
-        self.canvas.points = self.points
-        self.canvas.simplices = new_simplices
-        self.canvas.triangle_colors = self.triangle_colors
-        self.canvas.triangle_alphas = self.triangle_alphas
-        self.canvas.line_alphas = self.line_alphas
-        self.canvas.lines_alpha = self.lines_alpha
-        self.canvas.triangles_alpha = self.triangles_alpha
-        self.canvas.polygons = self.polygons
-        self.canvas.valid_edges = self.valid_edges
-        if not for_export:
-            self.canvas.update()
+            self.line_alphas.fade(self.valid_edge_keys, delta)
+        self._release_hidden_alphas()
+
+    def _release_hidden_alphas(self):
+        """
+        Освобождение таблиц прозрачностей выключенных заливки и линий.
+
+        Пока слой выключен, его таблица не обновляется и только копируется холсту
+        на каждом кадре. При включении все текущие элементы добавляются заново
+        с полной прозрачностью, поэтому прежние значения не нужны.
+        """
+        if self.triangles_alpha == 0.0 and len(self.triangle_alphas) > 0:
+            self.triangle_alphas = FadeTable()
+        if self.lines_alpha == 0.0 and len(self.line_alphas) > 0:
+            self.line_alphas = FadeTable()
 
     def draw_frame(self):
         """Отрисовка текущего кадра."""
-        self.canvas.lines_alpha = self.lines_alpha
-        self.canvas.triangles_alpha = self.triangles_alpha
-        self.canvas.triangle_alphas = self.triangle_alphas
-        self.canvas.line_alphas = self.line_alphas
-        self.canvas.triangle_colors = self.triangle_colors
-        self.canvas.simplices = self.simplices
-        self.canvas.points = self.points
-        self.canvas.polygons = self.polygons
-        self.canvas.valid_edges = self.valid_edges
-        self.canvas.update()
+        self._join_frame()
+        self._sync_canvas()
+        self.canvas.mark_dirty()
 
     def generate_single_frame(self):
         """Генерация и отрисовка одиночного кадра."""
         logger.info("Генерация одиночного кадра")
+        self._join_frame()
         width, height, _, _, num_points, _, _ = self.get_parameters()
         self.initialize_points(num_points, width, height)
         self.is_static_frame = True
-        self.lines_alpha = 1.0 if self.show_lines_check.isChecked() else 0.0
-        self.triangles_alpha = 1.0 if self.fill_triangles_check.isChecked() else 0.0
-        self.canvas.lines_alpha = self.lines_alpha
-        self.canvas.triangles_alpha = self.triangles_alpha
+        self.lines_alpha = 1.0 if self.params.show_lines else 0.0
+        self.triangles_alpha = 1.0 if self.params.fill_triangles else 0.0
         self.update_triangulation_and_colors()
         self.draw_frame()
 
     def start_animation(self):
         """Запуск анимации с текущими точками."""
         logger.info("Запуск анимации")
+        self._join_frame()
         self.is_static_frame = False
         width, height, fps, _, num_points, _, _ = self.get_parameters()
-        if len(self.points) == 0 or len(self.points) != num_points + (4 if self.fixed_corners_check.isChecked() else 0) + (8 if self.side_points_check.isChecked() else 0) + sum(len(polygon) for polygon in self.polygons):
+        # Точки пересоздаются, только если их состав изменился с последней инициализации
+        if len(self.points) == 0 or self._points_layout != (num_points, self.params.fixed_corners, self.params.side_points):
             self.initialize_points(num_points, width, height)
-        self.canvas.points = self.points
-        self.canvas.polygons = self.polygons
-        self.canvas.valid_edges = self.valid_edges
-        self.lines_alpha = 1.0 if self.show_lines_check.isChecked() else 0.0
-        self.triangles_alpha = 1.0 if self.fill_triangles_check.isChecked() else 0.0
-        self.canvas.lines_alpha = self.lines_alpha
-        self.canvas.triangles_alpha = self.triangles_alpha
+        self.lines_alpha = 1.0 if self.params.show_lines else 0.0
+        self.triangles_alpha = 1.0 if self.params.fill_triangles else 0.0
         self.update_triangulation_and_colors()
-        self.timer.start(int(1000 / fps))
+        self._start_timer(fps)
 
     def stop_animation(self):
         """Остановка анимации с сохранением текущего кадра."""
         logger.info("Остановка анимации")
         self.timer.stop()
+        self._join_frame()
         self.is_static_frame = True
         self.draw_frame()
 
+    def shutdown(self):
+        """Остановка тактов и завершение фонового потока расчёта кадров."""
+        self.timer.stop()
+        self._join_frame()
+        self._executor.shutdown(wait=True)
+
     def update_points_and_frame(self):
         """Обновление точек и кадра при изменении num_points, width, height, чекбоксов или полигонов."""
-        logger.info("Обновление точек и кадра")
+        logger.debug("Обновление точек и кадра")
+        self._join_frame()
         width, height, fps, _, num_points, _, _ = self.get_parameters()
         self.initialize_points(num_points, width, height)
         if self.is_static_frame:
             self.draw_frame()
         else:
-            self.timer.setInterval(int(1000 / fps))
+            self._frame_interval = 1.0 / fps
             self.update_triangulation_and_colors()
-            self.canvas.update()
+            self.canvas.mark_dirty()
 
     def update_render_parameters(self):
         """Обновление параметров отрисовки (цвета, яркость, прозрачность) в реальном времени."""
-        logger.info("Обновление параметров отрисовки")
+        logger.debug("Обновление параметров отрисовки")
+        self._join_frame()
         if len(self.points) == 0:
             width, height, _, _, num_points, _, _ = self.get_parameters()
             self.initialize_points(num_points, width, height)
         else:
-            tri = Delaunay(self.points)
-            self.simplices = tri.simplices
-            # Обновляем допустимые ребра
-            self.valid_edges = []
-            for simplex in self.simplices:
-                for i in range(3):
-                    v0, v1 = simplex[i], simplex[(i + 1) % 3]
-                    intersects = False
-                    for polygon in self.polygons:
-                        if segment_intersects_polygon(self.points[v0], self.points[v1], polygon):
-                            intersects = True
-                            break
-                    if not intersects:
-                        self.valid_edges.append((v0, v1))
+            if self._geometry_dirty:
+                # Триангуляция и допустимые рёбра зависят только от координат точек,
+                # при смене цветов и прозрачностей без движения точек они не пересчитываются
+                self.simplices = self.triangulation.update(self.points)
+                self._geometry_dirty = False
+                self._update_valid_edges()
             if self.triangles_alpha > 0.0:
-                base_color = self.get_color()
-                self.triangle_colors = initialize_triangle_colors(
-                    self.simplices, base_color,
-                    self.brightness_range_slider.value(), self.triangle_colors
-                )
-                new_simplex_keys = set(tuple(sorted(simplex)) for simplex in self.simplices)
-                for simplex_key in new_simplex_keys:
-                    if simplex_key not in self.triangle_alphas:
-                        self.triangle_alphas[simplex_key] = 1.0
-                for simplex_key in list(self.triangle_alphas.keys()):
-                    if simplex_key not in new_simplex_keys:
-                        del self.triangle_alphas[simplex_key]
-                        if simplex_key in self.triangle_colors:
-                            del self.triangle_colors[simplex_key]
+                self._update_triangle_colors(self.params)
+                self.triangle_alphas.ensure(self.get_simplex_keys())
+                self.triangle_alphas.retain(self.get_simplex_keys())
             if self.lines_alpha > 0.0:
-                for edge in self.valid_edges:
-                    line_key = tuple(sorted(edge))
-                    if line_key not in self.line_alphas:
-                        self.line_alphas[line_key] = 1.0
-            self.canvas.triangle_colors = self.triangle_colors
-            self.canvas.triangle_alphas = self.triangle_alphas
-            self.canvas.line_alphas = self.line_alphas
-            self.canvas.simplices = self.simplices
-            self.canvas.lines_alpha = self.lines_alpha
-            self.canvas.triangles_alpha = self.triangles_alpha
-            self.canvas.polygons = self.polygons
-            self.canvas.valid_edges = self.valid_edges
-            self.canvas.update()
+                self.line_alphas.ensure(self.valid_edge_keys)
+            self._release_hidden_alphas()
+            self._sync_canvas()
+            self.canvas.mark_dirty()
 
     def update_velocities(self):
         """Обновление скоростей точек без изменения их позиций."""
-        logger.info("Обновление скоростей точек")
+        logger.debug("Обновление скоростей точек")
+        self._join_frame()
         if len(self.points) == 0:
             width, height, _, _, num_points, _, _ = self.get_parameters()
             self.initialize_points(num_points, width, height)
             return
 
         speed = self.get_speed()
-        num_fixed = 4 if self.fixed_corners_check.isChecked() else 0
-        num_side = 8 if self.side_points_check.isChecked() else 0
-        num_polygon = sum(len(polygon) for polygon in self.polygons)
+        num_fixed = 4 if self.params.fixed_corners else 0
+        num_side = 8 if self.params.side_points else 0
+        num_polygon = self._num_polygon_points
         num_total = len(self.points)
         free_points_end = num_total - num_fixed - num_side - num_polygon
 
         if free_points_end > 0:
-            current_speeds = np.linalg.norm(self.velocities[:free_points_end], axis=1)
-            non_zero = current_speeds > 1e-6
-            if np.any(non_zero):
-                normalized_velocities = np.zeros_like(self.velocities[:free_points_end])
-                normalized_velocities[non_zero] = (
-                    self.velocities[:free_points_end][non_zero] /
-                    current_speeds[non_zero][:, np.newaxis]
-                ) * speed
-                self.velocities[:free_points_end] = normalized_velocities
-            else:
-                angles = np.random.uniform(0, 2 * np.pi, free_points_end)
-                self.velocities[:free_points_end] = np.vstack([
-                    speed * np.cos(angles),
-                    speed * np.sin(angles)
-                ]).T
-
+            # Строки (2, N) скоростей: модуль и масштаб считаются по непрерывной памяти без копий (N, 2)
+            free_velocities = self._vxy[:, :free_points_end]
+            current_speeds = np.hypot(free_velocities[0], free_velocities[1])
+            stopped = current_speeds <= 1e-6
+            # Масштаб speed/|v| для движущихся точек, скорости меняются на месте без временных массивов (N, 2)
+            np.divide(speed, current_speeds, out=current_speeds, where=~stopped)
+            current_speeds[stopped] = 0.0
+            free_velocities *= current_speeds
+            # Остановившиеся точки получают скорость speed в случайном направлении
+            stopped = np.flatnonzero(stopped)
+            if len(stopped) > 0:
+                angles = np.random.uniform(0, 2 * np.pi, len(stopped))
+                free_velocities[0, stopped] = speed * np.cos(angles)
+                free_velocities[1, stopped] = speed * np.sin(angles)
+
+        side_idx = num_total - num_side - num_polygon
         if num_side > 0:
-            side_idx = num_total - num_side - num_polygon
-            side_speed = lambda: np.random.uniform(speed / 4, speed / 2) * np.random.choice([-1, 1])
-            for i in [side_idx, side_idx + 1, side_idx + 2, side_idx + 3]:
-                current_speed = abs(self.velocities[i, 0]) or side_speed()
-                self.velocities[i, 0] = np.sign(self.velocities[i, 0]) * speed / 2 if current_speed != 0 else side_speed()
-                self.velocities[i, 1] = 0
-            for i in [side_idx + 4, side_idx + 5, side_idx + 6, side_idx + 7]:
-                current_speed = abs(self.velocities[i, 1]) or side_speed()
-                self.velocities[i, 0] = 0
-                self.velocities[i, 1] = np.sign(self.velocities[i, 1]) * speed / 2 if current_speed != 0 else side_speed()
-
-        if num_fixed > 0 or num_polygon > 0:
-            self.velocities[free_points_end:] = 0
+            # Первые четыре боковые точки движутся вдоль горизонтальных сторон, остальные - вдоль вертикальных:
+            # вдоль стороны сохраняется направление и задаётся модуль speed/2, поперёк скорость нулевая
+            side_velocities = self._vxy[:, side_idx:side_idx + num_side]
+            axes = np.repeat([0, 1], num_side // 2)
+            columns = np.arange(num_side)
+            directions = np.sign(side_velocities[axes, columns])
+            magnitudes = np.full(num_side, speed / 2)
+            # Остановившиеся точки получают случайные направление и модуль, как при инициализации
+            stopped = np.flatnonzero(directions == 0)
+            directions[stopped] = np.random.choice([-1, 1], len(stopped))
+            magnitudes[stopped] = np.random.uniform(speed / 4, speed / 2, len(stopped))
+            side_velocities[:] = 0
+            side_velocities[axes, columns] = directions * magnitudes
+
+        # Угловые точки и вершины полигонов неподвижны; боковые точки между ними сохраняют скорость
+        self._vxy[:, free_points_end:free_points_end + num_fixed] = 0
+        self._vxy[:, side_idx + num_side:] = 0
 
         self.canvas.update()
 
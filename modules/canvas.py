@@ -1,35 +1,349 @@
 from PySide6.QtOpenGLWidgets import QOpenGLWidget
 from OpenGL.GL import *
 from OpenGL.GLU import *
-from modules.utils import initialize_points, get_color, initialize_triangle_colors, segment_intersects_polygon
-from modules.config_manager import ConfigManager
+from OpenGL.GL.shaders import compileProgram, compileShader
+from modules.utils import initialize_points, simplex_keys, unique_edges, edge_keys, initialize_triangle_colors
+from modules.config_manager import get_config
+from modules.fade import FadeTable
 from loguru import logger
 import numpy as np
 from scipy.spatial import Delaunay
 
+# Шейдеры переводят координаты холста в нормализованные и умножают прозрачность вершины
+# на общую прозрачность слоя (заливки или линий).
+# GLSL 1.20 со встроенными gl_Vertex и gl_Color работает с массивами glVertexPointer/glColorPointer
+# и в контекстах совместимости OpenGL 2.1
+_VERTEX_SHADER = """
+#version 120
+uniform vec2 viewport;
+void main() {
+    gl_Position = vec4(gl_Vertex.xy / viewport * 2.0 - 1.0, 0.0, 1.0);
+    gl_FrontColor = gl_Color;
+}
+"""
+_FRAGMENT_SHADER = """
+#version 120
+uniform float layer_alpha;
+void main() {
+    gl_FragColor = vec4(gl_Color.rgb, gl_Color.a * layer_alpha);
+}
+"""
+
+def _to_unorm8(values):
+    """Квантование значений 0..1 в uint8 для цветов вершин GL_UNSIGNED_BYTE."""
+    return np.rint(np.clip(values, 0.0, 1.0) * 255.0).astype(np.uint8)
+
+
+class _StreamBuffer:
+    """
+    Кольцо VBO для данных, перезаписываемых каждый кадр.
+
+    Каждая загрузка идёт в следующий буфер кольца через glBufferSubData, поэтому запись
+    не ждёт отрисовки, ещё читающей предыдущий буфер, а память драйвера выделяется
+    заново только при росте данных.
+    """
+    def __init__(self, count=3):
+        self.ids = [int(buffer) for buffer in np.atleast_1d(glGenBuffers(count))]
+        self.capacities = [0] * count
+        self.index = 0
+
+    def upload(self, data):
+        """Загрузка массива в следующий буфер кольца, который остаётся привязанным к GL_ARRAY_BUFFER."""
+        self.index = (self.index + 1) % len(self.ids)
+        glBindBuffer(GL_ARRAY_BUFFER, self.ids[self.index])
+        if data.nbytes > self.capacities[self.index]:
+            # Запас по размеру, чтобы рост триангуляции на несколько треугольников не вызывал новое выделение
+            capacity = max(data.nbytes, self.capacities[self.index] * 3 // 2)
+            glBufferData(GL_ARRAY_BUFFER, capacity, None, GL_DYNAMIC_DRAW)
+            self.capacities[self.index] = capacity
+        glBufferSubData(GL_ARRAY_BUFFER, 0, data.nbytes, data)
+
+    def bind(self):
+        """Привязка буфера с последними загруженными данными к GL_ARRAY_BUFFER."""
+        glBindBuffer(GL_ARRAY_BUFFER, self.ids[self.index])
+
+
 class OpenGLCanvas(QOpenGLWidget):
     def __init__(self, parent, get_parameters, ui):
         super().__init__(parent)
         self.get_parameters = get_parameters
         self.ui = ui
+        self.params = None  # RenderParams, назначается окном после создания панели управления
         self.points = np.array([])
         self.velocities = np.array([])
-        self.triangle_colors = {}
-        self.triangle_alphas = {}
-        self.line_alphas = {}
-        self.simplices = []
+        self.triangle_colors = np.empty((0, 4), dtype=np.float32)
+        self.triangle_alphas = FadeTable()
+        self.line_alphas = FadeTable()
+        self.simplices = np.empty((0, 3), dtype=np.int32)
+        self.simplex_keys = np.empty(0, dtype=np.int64)  # Упакованные ключи строк simplices
         self.polygons = []
+        self.valid_edges = np.empty((0, 2), dtype=np.int32)
+        self.valid_edge_keys = np.empty(0, dtype=np.int64)  # Упакованные ключи рёбер из valid_edges
         self.lines_alpha = 0.0
         self.triangles_alpha = 0.0
-        config_manager = ConfigManager('config.ini')
+        self.needs_redraw = True
+        self.needs_vertex_refresh = False
+        self._triangle_indices = None
+        self._triangle_keys = None
+        self._line_indices = None
+        self._line_keys = None
+        self._triangle_vertices = None
+        self._triangle_vertex_colors = None
+        self._line_vertices = None
+        self._line_vertex_colors = None
+        self._line_steady = None  # Маска линий с наибольшей прозрачностью по строкам _line_indices
+        self._line_fading = None  # Строки _line_indices остальных (появляющихся) линий
+        self._line_elements = None  # Индексы концов рёбер (uint32) линий из _line_steady для glDrawElements
+        self._line_elements_dirty = False
+        self._line_rgb = None
+        self._line_alpha = None  # Прозрачность линий из _line_steady
+        self._triangle_alpha_values = None  # uint8 прозрачности треугольников, записанные в _triangle_vertex_colors
+        self._triangle_colors_dirty = False
+        self._points_dirty = True  # Координаты точек изменились после загрузки в _point_stream
+        # Кольца VBO координат и цветов развёрнутых массивов, цветов треугольников и координат точек,
+        # буфер индексов рёбер; создаются в initializeGL
+        self._vertex_stream = None
+        self._color_stream = None
+        self._triangle_color_stream = None
+        self._point_stream = None
+        self._line_index_buffer = None
+        self._program = None  # Шейдерная программа; None - фиксированный конвейер
+        self._viewport_location = -1
+        self._layer_alpha_location = -1
+        self._layer_alpha = None  # Последнее значение uniform-переменной layer_alpha
+        # Последние переданные в контекст значения состояния OpenGL, повторные вызовы пропускаются
+        self._clear_color = None
+        self._line_width = None
+        self._point_size = None
+        config_manager = get_config()
         self.setMinimumSize(
             config_manager.get_int('Window', 'min_width', 400),
             config_manager.get_int('Window', 'min_height', 400)
         )
 
+    def set_state(self, points, simplices, simplex_keys, triangle_colors, triangle_alphas, line_alphas,
+                  triangles_alpha, lines_alpha, polygons, valid_edges, valid_edge_keys):
+        """
+        Приём состояния кадра от AnimationManager.
+
+        Если изменился набор треугольников, рёбер, цвета или общие прозрачности, массивы
+        вершин будут пересобраны при следующей отрисовке, даже если вызывающий код
+        запросит только обновление координат.
+
+        Args:
+            points (np.array): Координаты точек (N, 2).
+            simplices (np.array): Симплексы (T, 3).
+            simplex_keys (np.array): Упакованные ключи строк simplices.
+            triangle_colors (np.array): RGBA цвета по строкам simplices.
+            triangle_alphas (FadeTable): Прозрачности треугольников.
+            line_alphas (FadeTable): Прозрачности линий.
+            triangles_alpha (float): Общая прозрачность заливки.
+            lines_alpha (float): Общая прозрачность линий.
+            polygons (list): Полигоны.
+            valid_edges (np.array): int32 рёбра (E, 2), не пересекающие полигоны.
+            valid_edge_keys (np.array): Упакованные ключи valid_edges.
+        """
+        if (simplices is not self.simplices or triangle_colors is not self.triangle_colors
+                or triangles_alpha != self.triangles_alpha or lines_alpha != self.lines_alpha
+                or (valid_edges is not self.valid_edges and not np.array_equal(valid_edges, self.valid_edges))):
+            self.needs_redraw = True
+        self.points = points
+        self._points_dirty = True
+        self.simplices = simplices
+        self.simplex_keys = simplex_keys
+        self.triangle_colors = triangle_colors
+        self.triangle_alphas = triangle_alphas
+        self.line_alphas = line_alphas
+        self.triangles_alpha = triangles_alpha
+        self.lines_alpha = lines_alpha
+        self.polygons = polygons
+        self.valid_edges = valid_edges
+        self.valid_edge_keys = valid_edge_keys
+
+    def mark_dirty(self, positions_only=False):
+        """Пометка данных кадра как изменённых и запрос перерисовки.
+
+        Qt объединяет несколько вызовов update() до следующего paintGL в одну отрисовку,
+        а списки вершин пересобираются только для помеченного кадра.
+
+        Args:
+            positions_only (bool): Набор треугольников и рёбер и их цвета остались прежними.
+                Тогда в готовых массивах обновляются только координаты и прозрачности.
+        """
+        if positions_only:
+            self.needs_vertex_refresh = True
+        else:
+            self.needs_redraw = True
+        self.update()
+
+    def _refresh_vertices(self):
+        """Обновление координат и прозрачностей в готовых массивах без пересборки списков."""
+        if self._triangle_vertices is not None:
+            self._triangle_vertices[:] = self.points[self._triangle_indices].reshape(-1, 2)
+            alphas = self.triangle_alphas.lookup(self._triangle_keys, missing=0.0) * self._baked_alpha(self.triangles_alpha)
+            # После появления треугольников прозрачности не меняются, и буфер цветов не перезагружается
+            alphas = _to_unorm8(alphas)
+            if not np.array_equal(alphas, self._triangle_alpha_values):
+                self._triangle_alpha_values = alphas
+                self._triangle_vertex_colors[:, 3] = np.repeat(alphas, 3)
+                self._triangle_colors_dirty = True
+        if self._line_indices is not None:
+            alphas = self.line_alphas.lookup(self._line_keys, missing=0.0)
+            self._update_line_arrays(alphas * self._baked_alpha(self.lines_alpha))
+
+    def _update_line_arrays(self, alphas):
+        """
+        Подготовка линий кадра к отрисовке.
+
+        Линии с наибольшей прозрачностью (вне появления и исчезновения рёбер - все линии)
+        рисуются одним glDrawElements по индексам рёбер из VBO координат точек, буфер индексов
+        меняется только при изменении их набора. Развёрнутые массивы вершин и цветов собираются
+        лишь для немногих появляющихся линий. Цвет у всех линий один, поэтому порядок
+        наложения этих двух групп на результат смешивания не влияет.
+
+        Args:
+            alphas (np.array): Итоговые прозрачности линий по строкам _line_indices.
+        """
+        self._line_alpha = float(alphas.max())
+        steady = alphas == self._line_alpha
+        if self._line_steady is None or not np.array_equal(steady, self._line_steady):
+            self._line_steady = steady
+            self._line_elements = np.ascontiguousarray(self._line_indices[steady], dtype=np.uint32)
+            self._line_elements_dirty = True
+            self._line_fading = np.flatnonzero(~steady)
+        fading = self._line_fading
+        if len(fading) == 0:
+            self._line_vertices = None
+            return
+        self._line_vertices = np.ascontiguousarray(self.points[self._line_indices[fading]].reshape(-1, 2),
+                                                   dtype=np.float32)
+        self._line_vertex_colors = np.empty((2 * len(fading), 4), dtype=np.uint8)
+        self._line_vertex_colors[:, :3] = _to_unorm8(np.asarray(self._line_rgb))
+        self._line_vertex_colors[:, 3] = np.repeat(_to_unorm8(alphas[fading]), 2)
+
+    def _baked_alpha(self, layer_alpha):
+        """
+        Множитель общей прозрачности слоя, записываемый в цвета вершин.
+
+        С шейдерной программой общая прозрачность передаётся uniform-переменной
+        layer_alpha и умножается на GPU, поэтому цвета вершин от неё не зависят.
+        """
+        return 1.0 if self._program is not None else layer_alpha
+
+    def _set_layer_alpha(self, layer_alpha):
+        """Передача общей прозрачности слоя в шейдер, если она изменилась."""
+        if self._program is not None and layer_alpha != self._layer_alpha:
+            glUniform1f(self._layer_alpha_location, layer_alpha)
+            self._layer_alpha = layer_alpha
+
+    def _rebuild_draw_lists(self, color):
+        """Пересборка массивов вершин и цветов треугольников и линий из текущего состояния кадра.
+
+        Args:
+            color (tuple): RGB цвет линий.
+        """
+        self._triangle_vertices = None
+        # Цвета идут по строкам симплексов; при выключенной заливке они могут не соответствовать топологии
+        if self.triangles_alpha > 0.0 and len(self.triangle_colors) == len(self.simplices):
+            keys = self.simplex_keys
+            alphas = self.triangle_alphas.lookup(keys)
+            rows = np.flatnonzero(alphas >= 0.0)
+            if len(rows) > 0:
+                self._triangle_keys = keys[rows]
+                self._triangle_indices = np.asarray(self.simplices)[rows]
+                self._triangle_vertices = np.ascontiguousarray(
+                    self.points[self._triangle_indices].reshape(-1, 2), dtype=np.float32)
+                rgba = self.triangle_colors[rows]
+                rgba[:, 3] = alphas[rows] * self._baked_alpha(self.triangles_alpha)
+                rgba = _to_unorm8(rgba)
+                self._triangle_alpha_values = rgba[:, 3].copy()
+                self._triangle_vertex_colors = np.repeat(rgba, 3, axis=0)
+                self._triangle_colors_dirty = True
+
+        self._line_indices = None
+        self._line_vertices = None
+        self._line_steady = None
+        if self.lines_alpha > 0.0:
+            # Рёбра, пересекающие полигоны, уже отброшены при расчёте valid_edges в AnimationManager
+            alphas = self.line_alphas.lookup(self.valid_edge_keys)
+            rows = np.flatnonzero(alphas >= 0.0)
+            if len(rows) > 0:
+                self._line_keys = self.valid_edge_keys[rows]
+                self._line_indices = self.valid_edges[rows]
+                self._line_rgb = color
+                self._update_line_arrays(alphas[rows] * self._baked_alpha(self.lines_alpha))
+
+    def _draw_arrays(self, mode, vertices, colors, color_stream=None, upload_colors=True):
+        """
+        Отрисовка примитивов одним вызовом glDrawArrays; вершины и цвета загружаются в VBO одним блоком.
+
+        Args:
+            mode: Тип примитивов OpenGL.
+            vertices (np.array): float32 координаты вершин (V, 2).
+            colors (np.array): uint8 RGBA цвета вершин (V, 4).
+            color_stream (_StreamBuffer): Кольцо VBO цветов; по умолчанию общее, перезаписываемое каждым вызовом.
+            upload_colors (bool): Загружать ли цвета; False, если в color_stream уже лежат эти цвета.
+        """
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        if self._vertex_stream is not None:
+            self._vertex_stream.upload(vertices)
+            glVertexPointer(2, GL_FLOAT, 0, None)
+            color_stream = color_stream or self._color_stream
+            if upload_colors:
+                color_stream.upload(colors)
+            else:
+                color_stream.bind()
+            glColorPointer(4, GL_UNSIGNED_BYTE, 0, None)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+        else:
+            # VBO не созданы при инициализации, отрисовка из клиентских массивов
+            glVertexPointer(2, GL_FLOAT, 0, vertices)
+            glColorPointer(4, GL_UNSIGNED_BYTE, 0, colors)
+        glDrawArrays(mode, 0, len(vertices))
+        glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+
+    def _bind_points(self):
+        """
+        Указатель массива вершин на координаты точек кадра.
+
+        Координаты загружаются в VBO точек один раз после получения нового кадра,
+        его используют линии с общей прозрачностью и повторные отрисовки того же кадра.
+        """
+        if self._point_stream is None:
+            glVertexPointer(2, GL_FLOAT, 0, np.ascontiguousarray(self.points, dtype=np.float32))
+            return
+        if self._points_dirty:
+            self._point_stream.upload(np.ascontiguousarray(self.points, dtype=np.float32))
+            self._points_dirty = False
+        else:
+            self._point_stream.bind()
+        glVertexPointer(2, GL_FLOAT, 0, None)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def _draw_line_elements(self):
+        """Отрисовка линий с наибольшей прозрачностью одним glDrawElements по индексам рёбер и координатам точек."""
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glColor4f(*self._line_rgb, self._line_alpha)
+        self._bind_points()
+        if self._line_index_buffer is not None:
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self._line_index_buffer)
+            if self._line_elements_dirty:
+                glBufferData(GL_ELEMENT_ARRAY_BUFFER, self._line_elements.nbytes, self._line_elements, GL_STATIC_DRAW)
+                self._line_elements_dirty = False
+            glDrawElements(GL_LINES, self._line_elements.size, GL_UNSIGNED_INT, None)
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        else:
+            glDrawElements(GL_LINES, self._line_elements.size, GL_UNSIGNED_INT, self._line_elements)
+        glDisableClientState(GL_VERTEX_ARRAY)
+
     def initializeGL(self):
         try:
             glClearColor(0.0, 0.0, 0.0, 1.0)
+            self._clear_color = (0.0, 0.0, 0.0)
+            self._line_width = None
+            self._point_size = None
             glEnable(GL_BLEND)
             glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
             glEnable(GL_POINT_SMOOTH)
@@ -37,6 +351,16 @@ class OpenGLCanvas(QOpenGLWidget):
             glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
             glPixelStorei(GL_PACK_ALIGNMENT, 1)
             glEnable(GL_FRAMEBUFFER_SRGB)
+            self._vertex_stream = _StreamBuffer()
+            self._color_stream = _StreamBuffer()
+            self._triangle_color_stream = _StreamBuffer()
+            self._point_stream = _StreamBuffer()
+            self._line_index_buffer = glGenBuffers(1)
+            # Точки, цвета треугольников и индексы рёбер загружаются в новые буферы при следующей отрисовке
+            self._points_dirty = True
+            self._triangle_colors_dirty = True
+            self._line_elements_dirty = True
+            self._program = self._create_program()
             status = glCheckFramebufferStatus(GL_FRAMEBUFFER)
             if status != GL_FRAMEBUFFER_COMPLETE:
                 logger.error(f"Фреймбуфер не полный, статус: {status}")
@@ -44,13 +368,34 @@ class OpenGLCanvas(QOpenGLWidget):
         except Exception as e:
             logger.error(f"Ошибка инициализации OpenGL: {e}")
 
+    def _create_program(self):
+        """
+        Сборка шейдерной программы и её установка для всех последующих отрисовок.
+
+        Returns:
+            Идентификатор программы или None, если шейдеры не собрались
+            (тогда проекция задаётся матрицами фиксированного конвейера).
+        """
+        try:
+            program = compileProgram(compileShader(_VERTEX_SHADER, GL_VERTEX_SHADER),
+                                     compileShader(_FRAGMENT_SHADER, GL_FRAGMENT_SHADER))
+        except Exception as e:
+            logger.warning("Шейдеры недоступны, используется фиксированный конвейер: {}", e)
+            return None
+        glUseProgram(program)
+        self._viewport_location = glGetUniformLocation(program, "viewport")
+        self._layer_alpha_location = glGetUniformLocation(program, "layer_alpha")
+        self._layer_alpha = None
+        return program
+
     def resizeGL(self, w, h):
         """Обработка изменения размера окна с сохранением соотношения сторон."""
         try:
             if w <= 0 or h <= 0:
                 logger.warning(f"Некорректные размеры окна: {w}x{h}, пропуск")
                 return
-            width, height, _, _, _, _, _ = self.get_parameters()
+            parameters = self.get_parameters()
+            width, height = parameters.width, parameters.height
             if width <= 0 or height <= 0:
                 logger.warning(f"Некорректные размеры: {width}x{height}, используется 1080x1080")
                 width, height = 1080, 1080
@@ -74,102 +419,101 @@ class OpenGLCanvas(QOpenGLWidget):
             offset_y = max(0, int(offset_y))
 
             glViewport(offset_x, offset_y, view_width, view_height)
-            glMatrixMode(GL_PROJECTION)
-            glLoadIdentity()
-            gluOrtho2D(0, width, 0, height)
-            glMatrixMode(GL_MODELVIEW)
-            glLoadIdentity()
-            logger.debug(f"ResizeGL: window={w}x{h}, viewport=({offset_x}, {offset_y}, {view_width}x{view_height})")
+            if self._program is not None:
+                glUniform2f(self._viewport_location, width, height)
+            else:
+                glMatrixMode(GL_PROJECTION)
+                glLoadIdentity()
+                gluOrtho2D(0, width, 0, height)
+                glMatrixMode(GL_MODELVIEW)
+                glLoadIdentity()
+            logger.debug("ResizeGL: window={}x{}, viewport=({}, {}, {}x{})", w, h, offset_x, offset_y, view_width, view_height)
         except Exception as e:
             logger.error(f"Ошибка в resizeGL: {e}")
 
     def paintGL(self):
         """Рендеринг кадра с использованием OpenGL."""
         try:
-            glClear(GL_COLOR_BUFFER_BIT)
             width, height, _, _, num_points, point_size, line_width = self.get_parameters()
             if width <= 0 or height <= 0:
-                logger.warning(f"Некорректные размеры в paintGL: {width}x{height}, используется 1080x1080")
+                logger.warning("Некорректные размеры в paintGL: {}x{}, используется 1080x1080", width, height)
                 width, height = 1080, 1080
-            color = get_color(self.ui.main_hue_slider.value(),
-                             self.ui.main_saturation_slider.value(),
-                             self.ui.main_value_slider.value())
-            bg_color = get_color(self.ui.bg_hue_slider.value(),
-                                self.ui.bg_saturation_slider.value(),
-                                self.ui.bg_value_slider.value())
-            glClearColor(*bg_color, 1.0)
+            color = self.params.main_rgb
+            bg_color = self.params.bg_rgb
+            # Цвет очистки меняется только вслед за фоном и задаётся до glClear, чтобы новый фон
+            # появлялся в том же кадре. Сама очистка нужна каждый кадр: QOpenGLWidget не сохраняет
+            # содержимое буфера между кадрами, а появляющиеся треугольники и сглаженные края
+            # смешиваются с фоном
+            if bg_color != self._clear_color:
+                glClearColor(*bg_color, 1.0)
+                self._clear_color = bg_color
+            glClear(GL_COLOR_BUFFER_BIT)
 
             if len(self.points) == 0:
                 self.points, self.velocities = initialize_points(
                     num_points, width, height,
-                    self.ui.fixed_corners_check.isChecked(),
-                    self.ui.side_points_check.isChecked(),
-                    self.ui.speed_slider.value()
+                    self.params.fixed_corners,
+                    self.params.side_points,
+                    self.params.speed
                 )
+                self._points_dirty = True
                 tri = Delaunay(self.points)
-                self.simplices = tri.simplices
+                self.simplices = tri.simplices.astype(np.int32)
+                keys = simplex_keys(self.simplices)
+                self.simplex_keys = keys
                 self.triangle_colors = initialize_triangle_colors(
-                    self.simplices, color,
-                    self.ui.brightness_range_slider.value(), {}
+                    keys, color,
+                    self.params.brightness_range, keys[:0], self.triangle_colors
                 )
-                for simplex in self.simplices:
-                    simplex_key = tuple(sorted(simplex))
-                    self.triangle_alphas[simplex_key] = 1.0
-                for simplex in self.simplices:
-                    for i in range(3):
-                        v0, v1 = simplex[i], simplex[(i + 1) % 3]
-                        line_key = tuple(sorted([v0, v1]))
-                        self.line_alphas[line_key] = 1.0
+                self.triangle_alphas.ensure(keys)
+                edges = unique_edges(self.simplices)
+                self.valid_edges = edges
+                self.valid_edge_keys = edge_keys(edges)
+                self.line_alphas.ensure(self.valid_edge_keys)
+                self.needs_redraw = True
                 logger.debug("Инициализированы точки и триангуляция")
 
+            if self.needs_redraw:
+                self._rebuild_draw_lists(color)
+                self.needs_redraw = False
+                self.needs_vertex_refresh = False
+            elif self.needs_vertex_refresh:
+                self._refresh_vertices()
+                self.needs_vertex_refresh = False
+
             # Рендеринг треугольников
-            if self.triangles_alpha > 0.0:
-                logger.debug("Рендеринг треугольников с альфа-смешиванием")
-                glBegin(GL_TRIANGLES)
-                for simplex in self.simplices:
-                    simplex_key = tuple(sorted(simplex))
-                    if simplex_key in self.triangle_colors and simplex_key in self.triangle_alphas:
-                        r, g, b, _ = self.triangle_colors[simplex_key]
-                        alpha = self.triangle_alphas[simplex_key] * self.triangles_alpha
-                        glColor4f(r, g, b, alpha)
-                        for vertex in simplex:
-                            glVertex2f(self.points[vertex, 0], self.points[vertex, 1])
-                glEnd()
+            if self.triangles_alpha > 0.0 and self._triangle_vertices is not None:
+                self._set_layer_alpha(self.triangles_alpha)
+                self._draw_arrays(GL_TRIANGLES, self._triangle_vertices, self._triangle_vertex_colors,
+                                  self._triangle_color_stream, self._triangle_colors_dirty)
+                self._triangle_colors_dirty = False
 
             # Рендеринг линий
-            if self.lines_alpha > 0.0:
-                logger.debug("Рендеринг линий с альфа-смешиванием")
-                glLineWidth(line_width)
-                glBegin(GL_LINES)
-                for simplex in self.simplices:
-                    for i in range(3):
-                        v0, v1 = simplex[i], simplex[(i + 1) % 3]
-                        line_key = tuple(sorted([v0, v1]))
-                        if line_key in self.line_alphas:
-                            intersects = False
-                            for polygon in self.polygons:
-                                if segment_intersects_polygon(self.points[v0], self.points[v1], polygon):
-                                    intersects = True
-                                    break
-                            if not intersects:
-                                alpha = self.line_alphas[line_key] * self.lines_alpha
-                                glColor4f(*color, alpha)
-                                glVertex2f(self.points[v0, 0], self.points[v0, 1])
-                                glVertex2f(self.points[v1, 0], self.points[v1, 1])
-                glEnd()
+            if self.lines_alpha > 0.0 and self._line_indices is not None:
+                if line_width != self._line_width:
+                    glLineWidth(line_width)
+                    self._line_width = line_width
+                self._set_layer_alpha(self.lines_alpha)
+                if self._line_elements.size > 0:
+                    self._draw_line_elements()
+                if self._line_vertices is not None:
+                    self._draw_arrays(GL_LINES, self._line_vertices, self._line_vertex_colors)
 
             # Рендеринг точек
-            if self.ui.show_points_check.isChecked():
-                logger.debug("Рендеринг точек с альфа-смешиванием")
-                glPointSize(point_size / 10.0)
-                glBegin(GL_POINTS)
+            if self.params.show_points:
+                if point_size != self._point_size:
+                    glPointSize(point_size / 10.0)
+                    self._point_size = point_size
+                # Все точки рисуются одним вызовом из VBO координат, загруженного один раз за кадр
+                self._set_layer_alpha(1.0)
                 glColor4f(*color, 1.0)
-                for point in self.points:
-                    glVertex2f(point[0], point[1])
-                glEnd()
+                glEnableClientState(GL_VERTEX_ARRAY)
+                self._bind_points()
+                glDrawArrays(GL_POINTS, 0, len(self.points))
+                glDisableClientState(GL_VERTEX_ARRAY)
 
         except Exception as e:
-            logger.error(f"Ошибка в paintGL: {e}")
+            logger.error("Ошибка в paintGL: {}", e)
 
     def update_frame(self):
         """Обновление кадра."""
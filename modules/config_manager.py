@@ -1,7 +1,16 @@
 import configparser
-import os
+from pathlib import Path
 from loguru import logger
 
+# Parsed configuration files shared between instances: path -> (mtime_ns, parser, values, converted)
+_parsed_configs = {}
+# Instances handed out by get_config: path -> ConfigManager
+_instances = {}
+
+def _parse_bool(value):
+    """Convert a configuration string to bool the way ConfigParser.getboolean does."""
+    return configparser.ConfigParser.BOOLEAN_STATES[value.lower()]
+
 class ConfigManager:
     """
     Manage configuration settings from a config.ini file.
@@ -13,15 +22,58 @@ class ConfigManager:
         Args:
             config_file (str): Path to the configuration file (default: 'config.ini').
         """
-        self.config = configparser.ConfigParser()
         self.config_file = config_file
-        if os.path.exists(config_file):
+        path = Path(config_file)
+        if path.is_file():
+            mtime = path.stat().st_mtime_ns
+            cached = _parsed_configs.get(config_file)
+            if cached is not None and cached[0] == mtime:
+                # The file has not changed since it was last parsed
+                _, self.config, self._values, self._converted = cached
+                return
+            self.config = configparser.ConfigParser()
+            self._values = {}
+            # Typed values already converted by the getters: (section, key, converter) -> value
+            self._converted = {}
             self.config.read(config_file)
+            # Preload every option once so lookups are plain dict hits
+            for section in self.config.sections():
+                for key, value in self.config[section].items():
+                    self._values[(section, key)] = value
+            _parsed_configs[config_file] = (mtime, self.config, self._values, self._converted)
             logger.info(f"Loaded configuration from {config_file}")
         else:
             self.config = None
+            self._values = {}
+            self._converted = {}
             logger.warning(f"Configuration file {config_file} not found")
 
+    def _lookup(self, section, key):
+        """
+        Get the raw string value for a section/key pair.
+
+        Raises:
+            KeyError: If the option is not present in the configuration.
+        """
+        return self._values[(section, self.config.optionxform(key))]
+
+    def _get(self, section, key, convert):
+        """
+        Get a converted value for a section/key pair, memoised per converter.
+
+        Raises:
+            KeyError: If the option is not present in the configuration.
+            ValueError: If the value cannot be converted.
+        """
+        cache_key = (section, key, convert)
+        try:
+            return self._converted[cache_key]
+        except KeyError:
+            pass
+        value = convert(self._lookup(section, key))
+        self._converted[cache_key] = value
+        return value
+
     def get_int(self, section, key, fallback):
         """
         Get an integer value from the configuration.
@@ -36,7 +88,7 @@ class ConfigManager:
         """
         try:
             if self.config and section in self.config:
-                return int(self.config[section][key])
+                return self._get(section, key, int)
             return fallback
         except (KeyError, ValueError) as e:
             logger.warning(f"Error reading {section}.{key}, using fallback: {fallback}. Error: {e}")
@@ -56,7 +108,7 @@ class ConfigManager:
         """
         try:
             if self.config and section in self.config:
-                return float(self.config[section][key])
+                return self._get(section, key, float)
             return fallback
         except (KeyError, ValueError) as e:
             logger.warning(f"Error reading {section}.{key}, using fallback: {fallback}. Error: {e}")
@@ -76,7 +128,7 @@ class ConfigManager:
         """
         try:
             if self.config and section in self.config:
-                return self.config.getboolean(section, key)
+                return self._get(section, key, _parse_bool)
             return fallback
         except (KeyError, ValueError) as e:
             logger.warning(f"Error reading {section}.{key}, using fallback: {fallback}. Error: {e}")
@@ -96,8 +148,26 @@ class ConfigManager:
         """
         try:
             if self.config and section in self.config:
-                return self.config[section][key]
+                return self._lookup(section, key)
             return fallback
         except (KeyError, ValueError) as e:
             logger.warning(f"Error reading {section}.{key}, using fallback: {fallback}. Error: {e}")
-            return fallback
\ No newline at end of file
+            return fallback
+
+def get_config(config_file='config.ini'):
+    """
+    Get the process-wide ConfigManager for a configuration file.
+
+    The instance is created on first use, so later callers skip the file
+    stat and parse-cache check that constructing a ConfigManager performs.
+
+    Args:
+        config_file (str): Path to the configuration file (default: 'config.ini').
+
+    Returns:
+        ConfigManager: The shared instance.
+    """
+    manager = _instances.get(config_file)
+    if manager is None:
+        manager = _instances[config_file] = ConfigManager(config_file)
+    return manager
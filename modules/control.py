@@ -1,6 +1,8 @@
 from PySide6.QtWidgets import QWidget, QGridLayout, QHBoxLayout, QLineEdit, QPushButton, QLabel, QSlider, QCheckBox, QProgressBar, QSizePolicy, QGroupBox, QVBoxLayout, QTextEdit
-from PySide6.QtCore import Qt
-from modules.config_manager import ConfigManager
+from PySide6.QtCore import Qt, QLocale
+from PySide6.QtGui import QIntValidator, QDoubleValidator
+from modules.config_manager import get_config
+from modules.inputs import IntLineEdit, FloatLineEdit
 from loguru import logger
 
 def setup_control_panel(window, get_parameters, canvas_class):
@@ -18,7 +20,8 @@ def setup_control_panel(window, get_parameters, canvas_class):
                 logger.debug("Холст или get_parameters не инициализированы")
                 return
             try:
-                width, height, _, _, _, _, _ = get_parameters()
+                parameters = get_parameters()
+                width, height = parameters.width, parameters.height
                 if width <= 0 or height <= 0:
                     logger.warning(f"Некорректные размеры: {width}x{height}, используется {config_manager.get_int('Canvas', 'default_width', 1080)}x{config_manager.get_int('Canvas', 'default_height', 1080)}")
                     width = config_manager.get_int('Canvas', 'default_width', 1080)
@@ -67,11 +70,14 @@ def setup_control_panel(window, get_parameters, canvas_class):
 
     ui = UIContainer()
 
-    config_manager = ConfigManager('config.ini')
+    config_manager = get_config()
 
     def get_config_value(section, key, fallback):
         return config_manager.get_string(section, key, fallback)
 
+    def get_config_int(section, key, fallback):
+        return config_manager.get_int(section, key, fallback)
+
     def get_config_bool(section, key, fallback):
         return config_manager.get_bool(section, key, fallback)
 
@@ -94,11 +100,31 @@ def setup_control_panel(window, get_parameters, canvas_class):
     control_layout.setSpacing(30)
     main_layout.addWidget(control_widget, stretch=1)
 
-    ui.width_input = QLineEdit(get_config_value('WidthInput', 'default', '1080'))
-    ui.height_input = QLineEdit(get_config_value('HeightInput', 'default', '1920'))
-    ui.fps_input = QLineEdit(get_config_value('FPSInput', 'default', '30'))
-    ui.duration_input = QLineEdit(get_config_value('DurationInput', 'default', '5'))
-    ui.points_input = QLineEdit(get_config_value('PointsInput', 'default', '50'))
+    ui.width_input = IntLineEdit(get_config_value('WidthInput', 'default', '1080'))
+    ui.height_input = IntLineEdit(get_config_value('HeightInput', 'default', '1920'))
+    ui.fps_input = FloatLineEdit(get_config_value('FPSInput', 'default', '30'))
+    ui.duration_input = FloatLineEdit(get_config_value('DurationInput', 'default', '5'))
+    ui.points_input = IntLineEdit(get_config_value('PointsInput', 'default', '50'))
+    # Валидаторы отсекают некорректный ввод на уровне Qt, до разбора в get_parameters
+    ui.width_input.setValidator(QIntValidator(
+        get_config_int('WidthInput', 'min', 1), get_config_int('WidthInput', 'max', 3840), ui.width_input))
+    ui.height_input.setValidator(QIntValidator(
+        get_config_int('HeightInput', 'min', 1), get_config_int('HeightInput', 'max', 3840), ui.height_input))
+    ui.points_input.setValidator(QIntValidator(
+        get_config_int('PointsInput', 'min', 3), get_config_int('PointsInput', 'max', 1000), ui.points_input))
+    duration_validator = QDoubleValidator(
+        config_manager.get_float('DurationInput', 'min', 0.1),
+        config_manager.get_float('DurationInput', 'max', 60), 2, ui.duration_input)
+    duration_validator.setNotation(QDoubleValidator.Notation.StandardNotation)
+    duration_validator.setLocale(QLocale.c())
+    ui.duration_input.setValidator(duration_validator)
+    # Частота кадров может быть дробной (29.97, 23.976), поэтому валидатор вещественный, как у длительности
+    fps_validator = QDoubleValidator(
+        config_manager.get_float('FPSInput', 'min', 1),
+        config_manager.get_float('FPSInput', 'max', 120), 3, ui.fps_input)
+    fps_validator.setNotation(QDoubleValidator.Notation.StandardNotation)
+    fps_validator.setLocale(QLocale.c())
+    ui.fps_input.setValidator(fps_validator)
     ui.polygons_input = QTextEdit()
     ui.polygons_input.setPlaceholderText("(x1,y1),(x2,y2),(x3,y3)\n(x4,y4),(x5,y5),(x6,y6)")
     ui.polygons_input.setFixedHeight(100)
@@ -115,45 +141,45 @@ def setup_control_panel(window, get_parameters, canvas_class):
     ui.fill_triangles_check.setChecked(get_config_bool('FillTrianglesCheck', 'default', False))
 
     ui.speed_slider = QSlider(Qt.Orientation.Horizontal)
-    ui.speed_slider.setMinimum(int(get_config_value('SpeedSlider', 'min', '0')))
-    ui.speed_slider.setMaximum(int(get_config_value('SpeedSlider', 'max', '33')))
-    ui.speed_slider.setValue(int(get_config_value('SpeedSlider', 'default', '16')))
+    ui.speed_slider.setMinimum(get_config_int('SpeedSlider', 'min', 0))
+    ui.speed_slider.setMaximum(get_config_int('SpeedSlider', 'max', 33))
+    ui.speed_slider.setValue(get_config_int('SpeedSlider', 'default', 16))
     ui.speed_slider.setTickPosition(QSlider.TickPosition.TicksBelow)
     ui.speed_slider.setTickInterval(5)
     ui.speed_input = QLineEdit(str(ui.speed_slider.value()))
     ui.speed_input.setFixedWidth(50)
 
     ui.point_size_slider = QSlider(Qt.Orientation.Horizontal)
-    ui.point_size_slider.setMinimum(int(get_config_value('PointSizeSlider', 'min', '1')))
-    ui.point_size_slider.setMaximum(int(get_config_value('PointSizeSlider', 'max', '100')))
-    ui.point_size_slider.setValue(int(get_config_value('PointSizeSlider', 'default', '20')))
+    ui.point_size_slider.setMinimum(get_config_int('PointSizeSlider', 'min', 1))
+    ui.point_size_slider.setMaximum(get_config_int('PointSizeSlider', 'max', 100))
+    ui.point_size_slider.setValue(get_config_int('PointSizeSlider', 'default', 20))
     ui.point_size_slider.setTickPosition(QSlider.TickPosition.TicksBelow)
     ui.point_size_slider.setTickInterval(10)
     ui.point_size_input = QLineEdit(str(ui.point_size_slider.value()))
     ui.point_size_input.setFixedWidth(50)
 
     ui.line_width_slider = QSlider(Qt.Orientation.Horizontal)
-    ui.line_width_slider.setMinimum(int(get_config_value('LineWidthSlider', 'min', '1')))
-    ui.line_width_slider.setMaximum(int(get_config_value('LineWidthSlider', 'max', '20')))
-    ui.line_width_slider.setValue(int(get_config_value('LineWidthSlider', 'default', '4')))
+    ui.line_width_slider.setMinimum(get_config_int('LineWidthSlider', 'min', 1))
+    ui.line_width_slider.setMaximum(get_config_int('LineWidthSlider', 'max', 20))
+    ui.line_width_slider.setValue(get_config_int('LineWidthSlider', 'default', 4))
     ui.line_width_slider.setTickPosition(QSlider.TickPosition.TicksBelow)
     ui.line_width_slider.setTickInterval(2)
     ui.line_width_input = QLineEdit(str(ui.line_width_slider.value()))
     ui.line_width_input.setFixedWidth(50)
 
     ui.brightness_range_slider = QSlider(Qt.Orientation.Horizontal)
-    ui.brightness_range_slider.setMinimum(int(get_config_value('BrightnessRangeSlider', 'min', '0')))
-    ui.brightness_range_slider.setMaximum(int(get_config_value('BrightnessRangeSlider', 'max', '100')))
-    ui.brightness_range_slider.setValue(int(get_config_value('BrightnessRangeSlider', 'default', '50')))
+    ui.brightness_range_slider.setMinimum(get_config_int('BrightnessRangeSlider', 'min', 0))
+    ui.brightness_range_slider.setMaximum(get_config_int('BrightnessRangeSlider', 'max', 100))
+    ui.brightness_range_slider.setValue(get_config_int('BrightnessRangeSlider', 'default', 50))
     ui.brightness_range_slider.setTickPosition(QSlider.TickPosition.TicksBelow)
     ui.brightness_range_slider.setTickInterval(10)
     ui.brightness_range_input = QLineEdit(str(ui.brightness_range_slider.value()))
     ui.brightness_range_input.setFixedWidth(50)
 
     ui.transition_speed_slider = QSlider(Qt.Orientation.Horizontal)
-    ui.transition_speed_slider.setMinimum(int(get_config_value('TransitionSpeedSlider', 'min', '5')))
-    ui.transition_speed_slider.setMaximum(int(get_config_value('TransitionSpeedSlider', 'max', '40')))
-    ui.transition_speed_slider.setValue(int(get_config_value('TransitionSpeedSlider', 'default', '20')))
+    ui.transition_speed_slider.setMinimum(get_config_int('TransitionSpeedSlider', 'min', 5))
+    ui.transition_speed_slider.setMaximum(get_config_int('TransitionSpeedSlider', 'max', 40))
+    ui.transition_speed_slider.setValue(get_config_int('TransitionSpeedSlider', 'default', 20))
     ui.transition_speed_slider.setTickPosition(QSlider.TickPosition.TicksBelow)
     ui.transition_speed_slider.setTickInterval(5)
     ui.transition_speed_input = QLineEdit(str(ui.transition_speed_slider.value()))
@@ -283,11 +309,12 @@ def setup_control_panel(window, get_parameters, canvas_class):
         except ValueError:
             ui.speed_input.setText(str(ui.speed_slider.value()))
 
-    ui.point_size_input.textChanged.connect(on_point_size_input_changed)
-    ui.line_width_input.textChanged.connect(on_line_width_input_changed)
-    ui.brightness_range_input.textChanged.connect(on_brightness_range_input_changed)
-    ui.transition_speed_input.textChanged.connect(on_transition_speed_input_changed)
-    ui.speed_input.textChanged.connect(on_speed_input_changed)
+    # editingFinished срабатывает один раз по Enter или потере фокуса, а не на каждое нажатие клавиши
+    ui.point_size_input.editingFinished.connect(on_point_size_input_changed)
+    ui.line_width_input.editingFinished.connect(on_line_width_input_changed)
+    ui.brightness_range_input.editingFinished.connect(on_brightness_range_input_changed)
+    ui.transition_speed_input.editingFinished.connect(on_transition_speed_input_changed)
+    ui.speed_input.editingFinished.connect(on_speed_input_changed)
 
     # Блок для основного цвета
     main_color_group = QGroupBox("Основной цвет")
@@ -296,27 +323,27 @@ def setup_control_panel(window, get_parameters, canvas_class):
     main_color_group.setSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Fixed)
 
     ui.main_hue_slider = QSlider(Qt.Orientation.Horizontal)
-    ui.main_hue_slider.setMinimum(int(get_config_value('MainHueSlider', 'min', '0')))
-    ui.main_hue_slider.setMaximum(int(get_config_value('MainHueSlider', 'max', '360')))
-    ui.main_hue_slider.setValue(int(get_config_value('MainHueSlider', 'default', '0')))
+    ui.main_hue_slider.setMinimum(get_config_int('MainHueSlider', 'min', 0))
+    ui.main_hue_slider.setMaximum(get_config_int('MainHueSlider', 'max', 360))
+    ui.main_hue_slider.setValue(get_config_int('MainHueSlider', 'default', 0))
     ui.main_hue_slider.setTickPosition(QSlider.TickPosition.TicksBelow)
     ui.main_hue_slider.setTickInterval(10)
     ui.main_hue_input = QLineEdit(str(ui.main_hue_slider.value()))
     ui.main_hue_input.setFixedWidth(50)
 
     ui.main_saturation_slider = QSlider(Qt.Orientation.Horizontal)
-    ui.main_saturation_slider.setMinimum(int(get_config_value('MainSaturationSlider', 'min', '0')))
-    ui.main_saturation_slider.setMaximum(int(get_config_value('MainSaturationSlider', 'max', '100')))
-    ui.main_saturation_slider.setValue(int(get_config_value('MainSaturationSlider', 'default', '100')))
+    ui.main_saturation_slider.setMinimum(get_config_int('MainSaturationSlider', 'min', 0))
+    ui.main_saturation_slider.setMaximum(get_config_int('MainSaturationSlider', 'max', 100))
+    ui.main_saturation_slider.setValue(get_config_int('MainSaturationSlider', 'default', 100))
     ui.main_saturation_slider.setTickPosition(QSlider.TickPosition.TicksBelow)
     ui.main_saturation_slider.setTickInterval(10)
     ui.main_saturation_input = QLineEdit(str(ui.main_saturation_slider.value()))
     ui.main_saturation_input.setFixedWidth(50)
 
     ui.main_value_slider = QSlider(Qt.Orientation.Horizontal)
-    ui.main_value_slider.setMinimum(int(get_config_value('MainValueSlider', 'min', '0')))
-    ui.main_value_slider.setMaximum(int(get_config_value('MainValueSlider', 'max', '100')))
-    ui.main_value_slider.setValue(int(get_config_value('MainValueSlider', 'default', '50')))
+    ui.main_value_slider.setMinimum(get_config_int('MainValueSlider', 'min', 0))
+    ui.main_value_slider.setMaximum(get_config_int('MainValueSlider', 'max', 100))
+    ui.main_value_slider.setValue(get_config_int('MainValueSlider', 'default', 50))
     ui.main_value_slider.setTickPosition(QSlider.TickPosition.TicksBelow)
     ui.main_value_slider.setTickInterval(10)
     ui.main_value_input = QLineEdit(str(ui.main_value_slider.value()))
@@ -376,9 +403,9 @@ def setup_control_panel(window, get_parameters, canvas_class):
         except ValueError:
             ui.main_value_input.setText(str(ui.main_value_slider.value()))
 
-    ui.main_hue_input.textChanged.connect(on_hue_input_changed)
-    ui.main_saturation_input.textChanged.connect(on_saturation_input_changed)
-    ui.main_value_input.textChanged.connect(on_value_input_changed)
+    ui.main_hue_input.editingFinished.connect(on_hue_input_changed)
+    ui.main_saturation_input.editingFinished.connect(on_saturation_input_changed)
+    ui.main_value_input.editingFinished.connect(on_value_input_changed)
 
     # Блок для цвета фона
     bg_color_group = QGroupBox("Цвет фона")
@@ -387,27 +414,27 @@ def setup_control_panel(window, get_parameters, canvas_class):
     bg_color_group.setSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Fixed)
 
     ui.bg_hue_slider = QSlider(Qt.Orientation.Horizontal)
-    ui.bg_hue_slider.setMinimum(int(get_config_value('BackgroundColorSlider', 'min', '0')))
-    ui.bg_hue_slider.setMaximum(int(get_config_value('BackgroundColorSlider', 'max', '360')))
-    ui.bg_hue_slider.setValue(int(get_config_value('BackgroundColorSlider', 'default', '0')))
+    ui.bg_hue_slider.setMinimum(get_config_int('BackgroundColorSlider', 'min', 0))
+    ui.bg_hue_slider.setMaximum(get_config_int('BackgroundColorSlider', 'max', 360))
+    ui.bg_hue_slider.setValue(get_config_int('BackgroundColorSlider', 'default', 0))
     ui.bg_hue_slider.setTickPosition(QSlider.TickPosition.TicksBelow)
     ui.bg_hue_slider.setTickInterval(10)
     ui.bg_hue_input = QLineEdit(str(ui.bg_hue_slider.value()))
     ui.bg_hue_input.setFixedWidth(50)
 
     ui.bg_saturation_slider = QSlider(Qt.Orientation.Horizontal)
-    ui.bg_saturation_slider.setMinimum(int(get_config_value('BackgroundSaturationSlider', 'min', '0')))
-    ui.bg_saturation_slider.setMaximum(int(get_config_value('BackgroundSaturationSlider', 'max', '100')))
-    ui.bg_saturation_slider.setValue(int(get_config_value('BackgroundSaturationSlider', 'default', '100')))
+    ui.bg_saturation_slider.setMinimum(get_config_int('BackgroundSaturationSlider', 'min', 0))
+    ui.bg_saturation_slider.setMaximum(get_config_int('BackgroundSaturationSlider', 'max', 100))
+    ui.bg_saturation_slider.setValue(get_config_int('BackgroundSaturationSlider', 'default', 100))
     ui.bg_saturation_slider.setTickPosition(QSlider.TickPosition.TicksBelow)
     ui.bg_saturation_slider.setTickInterval(10)
     ui.bg_saturation_input = QLineEdit(str(ui.bg_saturation_slider.value()))
     ui.bg_saturation_input.setFixedWidth(50)
 
     ui.bg_value_slider = QSlider(Qt.Orientation.Horizontal)
-    ui.bg_value_slider.setMinimum(int(get_config_value('BackgroundBrightnessSlider', 'min', '0')))
-    ui.bg_value_slider.setMaximum(int(get_config_value('BackgroundBrightnessSlider', 'max', '100')))
-    ui.bg_value_slider.setValue(int(get_config_value('BackgroundBrightnessSlider', 'default', '0')))
+    ui.bg_value_slider.setMinimum(get_config_int('BackgroundBrightnessSlider', 'min', 0))
+    ui.bg_value_slider.setMaximum(get_config_int('BackgroundBrightnessSlider', 'max', 100))
+    ui.bg_value_slider.setValue(get_config_int('BackgroundBrightnessSlider', 'default', 0))
     ui.bg_value_slider.setTickPosition(QSlider.TickPosition.TicksBelow)
     ui.bg_value_slider.setTickInterval(10)
     ui.bg_value_input = QLineEdit(str(ui.bg_value_slider.value()))
@@ -467,9 +494,9 @@ def setup_control_panel(window, get_parameters, canvas_class):
         except ValueError:
             ui.bg_value_input.setText(str(ui.bg_value_slider.value()))
 
-    ui.bg_hue_input.textChanged.connect(on_bg_hue_input_changed)
-    ui.bg_saturation_input.textChanged.connect(on_bg_saturation_input_changed)
-    ui.bg_value_input.textChanged.connect(on_bg_value_input_changed)
+    ui.bg_hue_input.editingFinished.connect(on_bg_hue_input_changed)
+    ui.bg_saturation_input.editingFinished.connect(on_bg_saturation_input_changed)
+    ui.bg_value_input.editingFinished.connect(on_bg_value_input_changed)
 
     # Блок для параметров скорости для
     speed_params_group = QGroupBox("Параметры скорости качества")
@@ -11,36 +11,25 @@ class ExportManager:
     """
     Управление экспортом кадров или анимаций, используя данные из AnimationManager.
     """
-    def __init__(self, anim_manager, fixed_corners_check, show_points_check,
-                 show_lines_check, fill_triangles_check, main_hue_slider,
-                 main_saturation_slider, main_value_slider, brightness_range_slider,
-                 speed_slider, bg_hue_slider, bg_saturation_slider, bg_value_slider,
-                 progress_bar, side_points_check, transition_speed_slider):
+    def __init__(self, anim_manager, params, progress_bar):
         """
         Инициализация менеджера экспорта.
+
+        Args:
+            anim_manager (AnimationManager): Источник данных кадра.
+            params (RenderParams): Снимок значений чекбоксов и слайдеров.
+            progress_bar (QProgressBar): Индикатор прогресса экспорта.
         """
         self.anim_manager = anim_manager
-        self.fixed_corners_check = fixed_corners_check
-        self.show_points_check = show_points_check
-        self.show_lines_check = show_lines_check
-        self.fill_triangles_check = fill_triangles_check
-        self.main_hue_slider = main_hue_slider
-        self.main_saturation_slider = main_saturation_slider
-        self.main_value_slider = main_value_slider
-        self.brightness_range_slider = brightness_range_slider
-        self.speed_slider = speed_slider
-        self.bg_hue_slider = bg_hue_slider
-        self.bg_saturation_slider = bg_saturation_slider
-        self.bg_value_slider = bg_value_slider
+        self.params = params
         self.progress_bar = progress_bar
-        self.side_points_check = side_points_check
-        self.transition_speed_slider = transition_speed_slider
 
     def export_frame(self):
         """Экспорт текущего кадра в изображение."""
         logger.info("Начало экспорта кадра")
         try:
-            width, height, _, _, _, _, _ = self.anim_manager.get_parameters()
+            parameters = self.anim_manager.get_parameters()
+            width, height = parameters.width, parameters.height
             file_path, _ = QFileDialog.getSaveFileName(
                 None, "Сохранить кадр", "", "PNG Files (*.png);;All Files (*)"
             )
@@ -52,7 +41,7 @@ class ExportManager:
             glPixelStorei(GL_PACK_ALIGNMENT, 1)
             data = glReadPixels(0, 0, width, height, GL_RGB, GL_UNSIGNED_BYTE)
             image = Image.frombytes("RGB", (width, height), data)
-            image = image.transpose(Image.FLIP_VERTICAL)
+            image = image.transpose(Image.Transpose.FLIP_TOP_BOTTOM)
             image.save(file_path, "PNG")
             logger.info(f"Кадр успешно экспортирован: {file_path}")
         except Exception as e:
@@ -78,20 +67,17 @@ class ExportManager:
 
             # Инициализация точек для анимации
             self.anim_manager.initialize_points(num_points, width, height)
-            self.anim_manager.lines_alpha = 1.0 if self.show_lines_check.isChecked() else 0.0
-            self.anim_manager.triangles_alpha = 1.0 if self.fill_triangles_check.isChecked() else 0.0
-            self.anim_manager.canvas.lines_alpha = self.anim_manager.lines_alpha
-            self.anim_manager.canvas.triangles_alpha = self.anim_manager.triangles_alpha
+            self.anim_manager.lines_alpha = 1.0 if self.params.show_lines else 0.0
+            self.anim_manager.triangles_alpha = 1.0 if self.params.fill_triangles else 0.0
             self.anim_manager.update_triangulation_and_colors()
 
+            glPixelStorei(GL_PACK_ALIGNMENT, 1)
             for frame in range(total_frames):
                 self.anim_manager.update_frame(for_export=True)
-                glPixelStorei(GL_PACK_ALIGNMENT, 1)
-                data = glReadPixels(0, 0, width, height, GL_RGB, GL_UNSIGNED_BYTE)
-                image = Image.frombytes("RGB", (width, height), data)
-                image = image.transpose(Image.FLIP_VERTICAL)
-                frame_data = np.array(image)
-                frame_data = cv2.cvtColor(frame_data, cv2.COLOR_RGB2BGR)
+                # Пиксели читаются сразу в порядке BGR, который ждёт VideoWriter, и переворачиваются
+                # одной копией без промежуточного изображения PIL
+                data = glReadPixels(0, 0, width, height, GL_BGR, GL_UNSIGNED_BYTE)
+                frame_data = cv2.flip(np.frombuffer(data, dtype=np.uint8).reshape(height, width, 3), 0)
                 out.write(frame_data)
                 self.progress_bar.setValue(frame + 1)
                 QCoreApplication.processEvents()
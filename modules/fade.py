@@ -0,0 +1,143 @@
+import numpy as np
+
+
+class FadeTable:
+    """
+    Прозрачности элементов триангуляции в виде структуры массивов.
+
+    Ключи (упакованные int64 из simplex_keys/edge_keys) хранятся отсортированными,
+    прозрачности лежат в параллельном float32-массиве. Появление и исчезновение
+    элементов считается векторно, без обхода словаря в Python.
+    """
+    def __init__(self):
+        self.keys = np.empty(0, dtype=np.int64)
+        self.alphas = np.empty(0, dtype=np.float32)
+        # Ключи кадра и таблицы, для которых в прошлом fade() посчитаны сортировка и маска живых строк
+        self._match_keys = None
+        self._match_table = None
+        self._sorted_keys = None
+        self._alive = None
+        self._num_alive = 0
+        self._increments = None  # float32 +шаг для живых строк и -шаг для исчезающих
+        self._increment_step = None
+
+    def __len__(self):
+        return len(self.keys)
+
+    def copy(self):
+        """
+        Снимок таблицы для холста.
+
+        Массив ключей никогда не меняется на месте (только заменяется новым),
+        поэтому копируются лишь прозрачности, которые fade() обновляет на месте.
+        """
+        table = FadeTable()
+        table.keys = self.keys
+        table.alphas = self.alphas.copy()
+        return table
+
+    def _contains(self, keys):
+        """Маска ключей keys, присутствующих в таблице."""
+        if len(self.keys) == 0:
+            return np.zeros(len(keys), dtype=bool)
+        positions = np.minimum(np.searchsorted(self.keys, keys), len(self.keys) - 1)
+        return self.keys[positions] == keys
+
+    def _append(self, keys, alpha):
+        """
+        Добавление отсутствующих ключей с начальной прозрачностью.
+
+        Args:
+            keys (np.array): Отсортированные уникальные ключи.
+            alpha (float): Прозрачность новых элементов.
+        """
+        keys = keys[~self._contains(keys)]
+        if len(keys) == 0:
+            return
+        # Слияние двух отсортированных массивов вставкой, без повторной сортировки таблицы
+        positions = np.searchsorted(self.keys, keys)
+        self.keys = np.insert(self.keys, positions, keys)
+        self.alphas = np.insert(self.alphas, positions, np.float32(alpha))
+
+    def ensure(self, keys, alpha=1.0):
+        """
+        Добавление ключей, которых ещё нет в таблице.
+
+        Args:
+            keys (np.array): Ключи текущих элементов.
+            alpha (float): Прозрачность новых элементов.
+        """
+        self._append(np.unique(np.asarray(keys, dtype=np.int64)), alpha)
+
+    def retain(self, keys):
+        """
+        Удаление ключей, не входящих в keys.
+
+        Args:
+            keys (np.array): Ключи текущих элементов.
+        """
+        alive = np.isin(self.keys, keys)
+        self.keys = self.keys[alive]
+        self.alphas = self.alphas[alive]
+
+    def fade(self, keys, delta):
+        """
+        Плавное появление текущих элементов и исчезновение пропавших.
+
+        Args:
+            keys (np.array): Ключи элементов текущей триангуляции.
+            delta (float): Изменение прозрачности за кадр.
+        """
+        # Шаг приводится к float32 один раз и используется и для появления, и для исчезновения
+        step = np.float32(min(delta, 1.0))
+        if self._match_keys is not keys or self._match_table is not self.keys:
+            sorted_keys = np.sort(np.asarray(keys, dtype=np.int64))
+            if len(sorted_keys) > 0:
+                positions = np.minimum(np.searchsorted(sorted_keys, self.keys), len(sorted_keys) - 1)
+                alive = sorted_keys[positions] == self.keys
+            else:
+                alive = np.zeros(len(self.keys), dtype=bool)
+            self._match_keys = keys
+            self._match_table = self.keys
+            self._sorted_keys = sorted_keys
+            self._alive = alive
+            self._num_alive = np.count_nonzero(alive)
+            self._increments = None
+        # Пока не меняются ни топология, ни состав таблицы, ни шаг, сортировка, поиск
+        # и вектор приращений прошлого кадра остаются верными
+        sorted_keys = self._sorted_keys
+        alive = self._alive
+        num_alive = self._num_alive
+        if self._increments is None or self._increment_step != step:
+            self._increments = np.where(alive, step, -step)
+            self._increment_step = step
+        # Одно прибавление готового вектора и один проход ограничения на месте
+        self.alphas += self._increments
+        np.clip(self.alphas, 0.0, 1.0, out=self.alphas)
+        if num_alive < len(self.keys):
+            keep = alive | (self.alphas > 0.01)
+            if not keep.all():
+                self.keys = self.keys[keep]
+                self.alphas = self.alphas[keep]
+        # Новые элементы начинают с нуля и сразу получают первый шаг появления; если каждый
+        # текущий ключ уже нашёлся в таблице, повторный поиск по ней не нужен
+        if num_alive < len(sorted_keys):
+            self._append(sorted_keys, step)
+
+    def lookup(self, keys, missing=-1.0):
+        """
+        Прозрачности для набора ключей.
+
+        Args:
+            keys (np.array): Ключи элементов.
+            missing (float): Значение для ключей, отсутствующих в таблице.
+
+        Returns:
+            np.array: float32 прозрачности, по одной на ключ.
+        """
+        keys = np.asarray(keys, dtype=np.int64)
+        found = self._contains(keys)
+        result = np.full(len(keys), missing, dtype=np.float32)
+        if np.any(found):
+            result[found] = self.alphas[np.searchsorted(self.keys, keys[found])]
+        return result
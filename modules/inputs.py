@@ -0,0 +1,71 @@
+from PySide6.QtWidgets import QLineEdit
+
+
+class IntLineEdit(QLineEdit):
+    """
+    Поле ввода целого числа с кэшированным значением.
+
+    Текст разбирается один раз при изменении, а intValue() возвращает
+    готовое число без повторного вызова int().
+    """
+    def __init__(self, text='', parent=None):
+        super().__init__(text, parent)
+        self._value = None
+        # Подключается первым, поэтому остальные обработчики textChanged видят новое значение
+        self.textChanged.connect(self._parse)
+        self._parse(text)
+
+    def _parse(self, text):
+        try:
+            self._value = int(text)
+        except ValueError:
+            self._value = None
+
+    def intValue(self):
+        """
+        Получение разобранного значения поля.
+
+        Returns:
+            int: Значение поля.
+
+        Raises:
+            ValueError: Если текст поля не является целым числом.
+        """
+        if self._value is None:
+            raise ValueError(f"Некорректное целое число: {self.text()!r}")
+        return self._value
+
+
+class FloatLineEdit(QLineEdit):
+    """
+    Поле ввода вещественного числа с кэшированным значением.
+
+    Текст разбирается один раз при изменении, а floatValue() возвращает
+    готовое число без повторного вызова float().
+    """
+    def __init__(self, text='', parent=None):
+        super().__init__(text, parent)
+        self._value = None
+        # Подключается первым, поэтому остальные обработчики textChanged видят новое значение
+        self.textChanged.connect(self._parse)
+        self._parse(text)
+
+    def _parse(self, text):
+        try:
+            self._value = float(text)
+        except ValueError:
+            self._value = None
+
+    def floatValue(self):
+        """
+        Получение разобранного значения поля.
+
+        Returns:
+            float: Значение поля.
+
+        Raises:
+            ValueError: Если текст поля не является числом.
+        """
+        if self._value is None:
+            raise ValueError(f"Некорректное число: {self.text()!r}")
+        return self._value
@@ -0,0 +1,162 @@
+from dataclasses import dataclass, field
+from typing import NamedTuple
+from modules.utils import get_color
+
+
+class AnimationParameters(NamedTuple):
+    """
+    Значения полей ввода и слайдеров размера, прочитанные одним проходом.
+
+    Кортеж неизменяемый и кэшируется окном до изменения полей, поэтому
+    на каждом кадре чтение параметров - обращение к атрибутам без вызовов Qt.
+    Распаковка в семь переменных по-прежнему работает.
+    """
+    width: int
+    height: int
+    fps: float
+    duration: float
+    num_points: int
+    point_size: int
+    line_width: int
+
+
+@dataclass(slots=True)
+class RenderParams:
+    """
+    Снимок значений виджетов панели управления.
+
+    Значения обновляются по сигналам виджетов, поэтому код анимации, экспорта
+    и отрисовки читает обычные атрибуты Python вместо вызовов isChecked()/value() через Qt.
+    RGB основного цвета и цвета фона пересчитываются вместе со снимком.
+    """
+    fixed_corners: bool
+    side_points: bool
+    show_points: bool
+    show_lines: bool
+    fill_triangles: bool
+    main_hue: int
+    main_saturation: int
+    main_value: int
+    brightness_range: int
+    speed: int
+    bg_hue: int
+    bg_saturation: int
+    bg_value: int
+    transition_speed: int
+    polygons_text: str
+    main_rgb: tuple = field(init=False)
+    bg_rgb: tuple = field(init=False)
+
+    def __post_init__(self):
+        self._update_colors()
+
+    def _update_colors(self):
+        """Пересчёт RGB основного цвета и цвета фона из HSV-значений снимка."""
+        self._update_main_color()
+        self._update_bg_color()
+
+    def _update_main_color(self):
+        """Пересчёт RGB основного цвета."""
+        self.main_rgb = get_color(self.main_hue, self.main_saturation, self.main_value)
+
+    def _update_bg_color(self):
+        """Пересчёт RGB цвета фона."""
+        self.bg_rgb = get_color(self.bg_hue, self.bg_saturation, self.bg_value)
+
+    @classmethod
+    def snapshot(cls, ui):
+        """
+        Создание снимка по текущему состоянию виджетов.
+
+        Args:
+            ui: Контейнер виджетов, возвращаемый setup_control_panel.
+
+        Returns:
+            RenderParams: Новый снимок параметров.
+        """
+        return cls(
+            fixed_corners=ui.fixed_corners_check.isChecked(),
+            side_points=ui.side_points_check.isChecked(),
+            show_points=ui.show_points_check.isChecked(),
+            show_lines=ui.show_lines_check.isChecked(),
+            fill_triangles=ui.fill_triangles_check.isChecked(),
+            main_hue=ui.main_hue_slider.value(),
+            main_saturation=ui.main_saturation_slider.value(),
+            main_value=ui.main_value_slider.value(),
+            brightness_range=ui.brightness_range_slider.value(),
+            speed=ui.speed_slider.value(),
+            bg_hue=ui.bg_hue_slider.value(),
+            bg_saturation=ui.bg_saturation_slider.value(),
+            bg_value=ui.bg_value_slider.value(),
+            transition_speed=ui.transition_speed_slider.value(),
+            polygons_text=ui.polygons_input.toPlainText(),
+        )
+
+    def update_from(self, ui):
+        """
+        Обновление снимка на месте по текущему состоянию виджетов.
+
+        Args:
+            ui: Контейнер виджетов, возвращаемый setup_control_panel.
+        """
+        self.fixed_corners = ui.fixed_corners_check.isChecked()
+        self.side_points = ui.side_points_check.isChecked()
+        self.show_points = ui.show_points_check.isChecked()
+        self.show_lines = ui.show_lines_check.isChecked()
+        self.fill_triangles = ui.fill_triangles_check.isChecked()
+        self.main_hue = ui.main_hue_slider.value()
+        self.main_saturation = ui.main_saturation_slider.value()
+        self.main_value = ui.main_value_slider.value()
+        self.brightness_range = ui.brightness_range_slider.value()
+        self.speed = ui.speed_slider.value()
+        self.bg_hue = ui.bg_hue_slider.value()
+        self.bg_saturation = ui.bg_saturation_slider.value()
+        self.bg_value = ui.bg_value_slider.value()
+        self.transition_speed = ui.transition_speed_slider.value()
+        self.polygons_text = ui.polygons_input.toPlainText()
+        self._update_colors()
+
+    def bind(self, ui):
+        """
+        Подключение сигналов виджетов к обновлению снимка.
+
+        Вызывается до подключения остальных обработчиков, чтобы они видели
+        уже обновлённые значения. Каждый сигнал обновляет только поле своего
+        виджета, RGB пересчитывается только при изменении слайдеров цвета.
+
+        Args:
+            ui: Контейнер виджетов, возвращаемый setup_control_panel.
+        """
+        checks = (
+            (ui.fixed_corners_check, 'fixed_corners'),
+            (ui.side_points_check, 'side_points'),
+            (ui.show_points_check, 'show_points'),
+            (ui.show_lines_check, 'show_lines'),
+            (ui.fill_triangles_check, 'fill_triangles'),
+        )
+        for check, name in checks:
+            check.stateChanged.connect(lambda state, check=check, name=name: setattr(self, name, check.isChecked()))
+
+        sliders = (
+            (ui.brightness_range_slider, 'brightness_range', None),
+            (ui.speed_slider, 'speed', None),
+            (ui.transition_speed_slider, 'transition_speed', None),
+            (ui.main_hue_slider, 'main_hue', self._update_main_color),
+            (ui.main_saturation_slider, 'main_saturation', self._update_main_color),
+            (ui.main_value_slider, 'main_value', self._update_main_color),
+            (ui.bg_hue_slider, 'bg_hue', self._update_bg_color),
+            (ui.bg_saturation_slider, 'bg_saturation', self._update_bg_color),
+            (ui.bg_value_slider, 'bg_value', self._update_bg_color),
+        )
+        for slider, name, update_color in sliders:
+            slider.valueChanged.connect(lambda value, name=name, update_color=update_color:
+                                        self._set_slider_value(name, value, update_color))
+
+        ui.polygons_input.textChanged.connect(
+            lambda: setattr(self, 'polygons_text', ui.polygons_input.toPlainText()))
+
+    def _set_slider_value(self, name, value, update_color):
+        """Запись значения слайдера в поле снимка с пересчётом зависящего от него RGB."""
+        setattr(self, name, value)
+        if update_color is not None:
+            update_color()
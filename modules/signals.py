@@ -0,0 +1,55 @@
+from PySide6.QtCore import QTimer
+
+
+def debounced(func, interval_ms, parent):
+    """
+    Обёртка для слота, откладывающая вызов до паузы в потоке сигналов.
+
+    Каждый вызов обёртки перезапускает одноразовый таймер, поэтому серия
+    сигналов (например, ввод с клавиатуры) приводит к одному вызову func.
+
+    Args:
+        func (callable): Слот без аргументов.
+        interval_ms (int): Пауза в миллисекундах перед вызовом.
+        parent (QObject): Владелец таймера.
+
+    Returns:
+        callable: Функция для подключения к сигналу.
+    """
+    timer = QTimer(parent)
+    timer.setSingleShot(True)
+    timer.setInterval(interval_ms)
+    timer.timeout.connect(func)
+
+    def trigger(*args):
+        timer.start()
+
+    return trigger
+
+
+def throttled(func, interval_ms, parent):
+    """
+    Обёртка для слота, ограничивающая частоту его вызовов.
+
+    Первый сигнал запускает таймер, последующие до его срабатывания
+    игнорируются; по таймауту func вызывается один раз с актуальным
+    состоянием интерфейса.
+
+    Args:
+        func (callable): Слот без аргументов.
+        interval_ms (int): Минимальный интервал между вызовами в миллисекундах.
+        parent (QObject): Владелец таймера.
+
+    Returns:
+        callable: Функция для подключения к сигналу.
+    """
+    timer = QTimer(parent)
+    timer.setSingleShot(True)
+    timer.setInterval(interval_ms)
+    timer.timeout.connect(func)
+
+    def trigger(*args):
+        if not timer.isActive():
+            timer.start()
+
+    return trigger
@@ -0,0 +1,227 @@
+import numpy as np
+from scipy.spatial import Delaunay
+
+# Относительный допуск для предикатов: социкличные четвёрки (например, углы холста)
+# не должны вызывать перестройку из-за ошибок округления
+_EPS = 1e-9
+# Доля треугольников, после которой локальные перевороты рёбер уступают полной перестройке
+_MAX_FLIP_FRACTION = 0.3
+
+
+class TriangulationCache:
+    """
+    Delaunay-триангуляция, переиспользуемая между кадрами.
+
+    За кадр точки смещаются на несколько пикселей, и топология триангуляции
+    обычно не меняется. Перед полной перестройкой через qhull прежние симплексы
+    проверяются векторизованно: все треугольники сохраняют ориентацию, оболочка
+    остаётся выпуклой и каждое внутреннее ребро удовлетворяет условию пустой
+    окружности. Если проверка проходит, триангуляция остаётся делонеевской.
+    Нарушившие условие рёбра исправляются локальными переворотами (алгоритм Лоусона),
+    qhull вызывается только при вывернутых треугольниках, изменении оболочки
+    или слишком большом числе переворотов.
+
+    Поиск треугольника, содержащего сместившуюся точку, не нужен: проверка идёт
+    по рёбрам прежней триангуляции, а обход переворотов начинается с нарушивших
+    условие рёбер, поэтому пространственный индекс треугольников не хранится.
+    """
+    def __init__(self):
+        self.simplices = np.empty((0, 3), dtype=np.int32)
+        self._neighbors = np.empty((0, 3), dtype=np.int32)
+        self._coords = np.empty((0, 2), dtype=np.float64)
+        self._valid = False
+        self._num_points = 0
+
+    def update(self, points):
+        """
+        Получение триангуляции для новых координат точек.
+
+        Args:
+            points (np.array): Координаты точек (N, 2).
+
+        Returns:
+            np.array: Симплексы (T, 3), вершины каждого треугольника против часовой стрелки.
+        """
+        # Предикаты считаются в float64, даже если координаты хранятся в float32;
+        # копия делается в постоянный буфер, а не в новый массив на каждом кадре
+        if self._coords.shape != np.shape(points):
+            self._coords = np.empty(np.shape(points), dtype=np.float64)
+        np.copyto(self._coords, points)
+        points = self._coords
+        if self._valid and len(points) == self._num_points:
+            illegal = self._illegal_edges(points)
+            if illegal is not None and (len(illegal) == 0 or self._flip(points, illegal)):
+                return self.simplices
+        self.rebuild(points)
+        return self.simplices
+
+    def rebuild(self, points):
+        """
+        Полная перестройка триангуляции.
+
+        Args:
+            points (np.array): Координаты точек (N, 2).
+
+        Returns:
+            np.array: Симплексы (T, 3).
+        """
+        points = np.asarray(points, dtype=np.float64)
+        tri = Delaunay(points)
+        simplices = tri.simplices.astype(np.int32)
+        neighbors = tri.neighbors.astype(np.int32)
+
+        # Приводим все треугольники к обходу против часовой стрелки;
+        # neighbors[t, j] лежит напротив вершины j и переставляется вместе с ней
+        clockwise = _orientation(points, simplices) < 0
+        simplices[clockwise] = simplices[clockwise][:, [0, 2, 1]]
+        neighbors[clockwise] = neighbors[clockwise][:, [0, 2, 1]]
+
+        self.simplices = simplices
+        self._neighbors = neighbors
+        self._num_points = len(points)
+        # Точки, отброшенные qhull (совпадающие), не входят в симплексы, такую триангуляцию не переиспользуем
+        self._valid = len(tri.coplanar) == 0 and len(simplices) > 0
+        if not self._valid:
+            return self.simplices
+
+        self._index_edges()
+
+        # Рёбра оболочки u -> v против часовой стрелки и следующая за v вершина w
+        t, j = np.nonzero(neighbors < 0)
+        hull_u = simplices[t, (j + 1) % 3]
+        hull_v = simplices[t, (j + 2) % 3]
+        next_vertex = np.full(len(points), -1, dtype=np.int32)
+        next_vertex[hull_u] = hull_v
+        self._hull_u = hull_u
+        self._hull_v = hull_v
+        self._hull_w = next_vertex[hull_v]
+        return self.simplices
+
+    def _index_edges(self):
+        """Внутренние рёбра: пара соседних треугольников (t, n) с t < n и вершина d из n напротив ребра."""
+        neighbors = self._neighbors
+        t, j = np.nonzero(neighbors >= 0)
+        n = neighbors[t, j]
+        once = t < n
+        t, j, n = t[once], j[once], n[once]
+        k = np.argmax(neighbors[n] == t[:, np.newaxis], axis=1)
+        self._edge_triangles = t
+        self._edge_slots = j
+        self._edge_opposite = self.simplices[n, k]
+
+    def _illegal_edges(self, points):
+        """
+        Проверка прежней триангуляции для новых координат.
+
+        Returns:
+            np.array | None: Пары (t, j) рёбер, нарушающих условие пустой окружности,
+            или None, если треугольник вывернулся или оболочка перестала быть выпуклой.
+        """
+        a = points[self.simplices[:, 0]]
+        ab = points[self.simplices[:, 1]] - a
+        ac = points[self.simplices[:, 2]] - a
+        orientation = ab[:, 0] * ac[:, 1] - ab[:, 1] * ac[:, 0]
+        orientation_scale = np.abs(ab[:, 0] * ac[:, 1]) + np.abs(ab[:, 1] * ac[:, 0])
+        # Вырожденные треугольники на прямых (точки на сторонах полигонов и холста) допустимы,
+        # перестройку вызывает только вывернутый треугольник
+        if np.any(orientation < -_EPS * orientation_scale):
+            return None
+
+        u = points[self._hull_u]
+        v = points[self._hull_v]
+        w = points[self._hull_w]
+        e1 = v - u
+        e2 = w - v
+        turn = e1[:, 0] * e2[:, 1] - e1[:, 1] * e2[:, 0]
+        turn_scale = np.abs(e1[:, 0] * e2[:, 1]) + np.abs(e1[:, 1] * e2[:, 0])
+        if np.any(turn < -_EPS * turn_scale):
+            return None
+
+        tri = points[self.simplices[self._edge_triangles]]
+        d = points[self._edge_opposite]
+        ad = tri[:, 0] - d
+        bd = tri[:, 1] - d
+        cd = tri[:, 2] - d
+        ad2 = np.einsum('ij,ij->i', ad, ad)
+        bd2 = np.einsum('ij,ij->i', bd, bd)
+        cd2 = np.einsum('ij,ij->i', cd, cd)
+        term_a = ad2 * (bd[:, 0] * cd[:, 1] - cd[:, 0] * bd[:, 1])
+        term_b = bd2 * (cd[:, 0] * ad[:, 1] - ad[:, 0] * cd[:, 1])
+        term_c = cd2 * (ad[:, 0] * bd[:, 1] - bd[:, 0] * ad[:, 1])
+        in_circle = term_a + term_b + term_c
+        scale = np.abs(term_a) + np.abs(term_b) + np.abs(term_c)
+        illegal = np.flatnonzero(in_circle > _EPS * scale)
+        return np.column_stack((self._edge_triangles[illegal], self._edge_slots[illegal]))
+
+    def _flip(self, points, illegal):
+        """
+        Восстановление условия Делоне переворотами рёбер.
+
+        Args:
+            points (np.array): Координаты точек (N, 2), float64.
+            illegal (np.array): Пары (t, j) рёбер, с которых начинается обход.
+
+        Returns:
+            bool: True, если триангуляция восстановлена; False, если нужна полная перестройка.
+        """
+        # Новый массив симплексов, чтобы изменение топологии было видно по идентичности объекта
+        simplices = self.simplices.copy()
+        neighbors = self._neighbors
+        max_flips = max(1, int(len(simplices) * _MAX_FLIP_FRACTION))
+        flips = 0
+        stack = [tuple(edge) for edge in illegal.tolist()]
+        while stack:
+            t, j = stack.pop()
+            n = neighbors[t, j]
+            if n < 0:
+                continue
+            k = int(np.argmax(neighbors[n] == t))
+            p = simplices[t, j]
+            q = simplices[t, (j + 1) % 3]
+            r = simplices[t, (j + 2) % 3]
+            d = simplices[n, k]
+            if not _in_circle(points, p, q, r, d):
+                continue
+            # Четырёхугольник p, q, d, r должен быть строго выпуклым, иначе переворот невозможен
+            if _orientation(points, np.array([[p, q, d], [p, d, r]])).min() <= 0:
+                return False
+            flips += 1
+            if flips > max_flips:
+                return False
+
+            rp = neighbors[t, (j + 1) % 3]
+            pq = neighbors[t, (j + 2) % 3]
+            qd = neighbors[n, (k + 1) % 3]
+            dr = neighbors[n, (k + 2) % 3]
+            simplices[t] = (p, q, d)
+            neighbors[t] = (qd, n, pq)
+            simplices[n] = (p, d, r)
+            neighbors[n] = (dr, rp, t)
+            if qd >= 0:
+                neighbors[qd][neighbors[qd] == n] = t
+            if rp >= 0:
+                neighbors[rp][neighbors[rp] == t] = n
+            stack.extend(((t, 0), (t, 2), (n, 0), (n, 1)))
+
+        self.simplices = simplices
+        self._index_edges()
+        return True
+
+
+def _in_circle(points, a, b, c, d):
+    """Лежит ли точка d строго внутри описанной окружности треугольника a, b, c (против часовой стрелки)."""
+    ad = points[a] - points[d]
+    bd = points[b] - points[d]
+    cd = points[c] - points[d]
+    term_a = (ad[0] * ad[0] + ad[1] * ad[1]) * (bd[0] * cd[1] - cd[0] * bd[1])
+    term_b = (bd[0] * bd[0] + bd[1] * bd[1]) * (cd[0] * ad[1] - ad[0] * cd[1])
+    term_c = (cd[0] * cd[0] + cd[1] * cd[1]) * (ad[0] * bd[1] - bd[0] * ad[1])
+    return term_a + term_b + term_c > _EPS * (abs(term_a) + abs(term_b) + abs(term_c))
+
+
+def _orientation(points, simplices):
+    """Удвоенная ориентированная площадь треугольников (> 0 для обхода против часовой стрелки)."""
+    a = points[simplices[:, 0]]
+    b = points[simplices[:, 1]]
+    c = points[simplices[:, 2]]
+    return (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0])
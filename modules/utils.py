@@ -1,5 +1,6 @@
 import numpy as np
 import colorsys
+from functools import lru_cache
 
 def initialize_points(num_points, width, height, fixed_corners, side_points, speed):
     """
@@ -14,10 +15,10 @@ def initialize_points(num_points, width, height, fixed_corners, side_points, spe
         speed (float): Base speed for point movement.
 
     Returns:
-        tuple: Arrays of points and velocities.
+        tuple: float32 arrays of points and velocities.
     """
-    points = np.random.rand(num_points, 2) * np.array([width, height])
-    velocities = (np.random.rand(num_points, 2) - 0.5) * speed
+    points = (np.random.rand(num_points, 2) * np.array([width, height])).astype(np.float32)
+    velocities = ((np.random.rand(num_points, 2) - 0.5) * speed).astype(np.float32)
 
     if fixed_corners:
         corner_points = np.array([
@@ -25,9 +26,9 @@ def initialize_points(num_points, width, height, fixed_corners, side_points, spe
             [width, 0],
             [0, height],
             [width, height]
-        ])
+        ], dtype=np.float32)
         points = np.vstack((points, corner_points))
-        velocities = np.vstack((velocities, np.zeros((4, 2))))
+        velocities = np.vstack((velocities, np.zeros((4, 2), dtype=np.float32)))
 
     if side_points:
         side_points_list = []
@@ -43,15 +44,56 @@ def initialize_points(num_points, width, height, fixed_corners, side_points, spe
         side_points_list.extend([[width, 0], [width, height]])
         side_velocities_list.extend([[0, side_speed()], [0, side_speed()]])
 
-        points = np.vstack((points, np.array(side_points_list)))
-        velocities = np.vstack((velocities, np.array(side_velocities_list)))
+        points = np.vstack((points, np.array(side_points_list, dtype=np.float32)))
+        velocities = np.vstack((velocities, np.array(side_velocities_list, dtype=np.float32)))
 
     return points, velocities
 
+def step_points(positions, velocities, width, height, num_free):
+    """
+    Advance all points by one frame and bounce free points off the canvas borders.
+
+    Args:
+        positions (np.ndarray): Point coordinates as (2, N) rows, updated in place.
+        velocities (np.ndarray): Point velocities as (2, N) rows, updated in place.
+        width (float): Canvas width.
+        height (float): Canvas height.
+        num_free (int): Number of leading free points that bounce off the borders.
+    """
+    positions += velocities
+    bounce_points(positions[:, :num_free], velocities[:, :num_free], width, height)
+
+def bounce_points(positions, velocities, width, height):
+    """
+    Reflect points that left the canvas back inside and reverse their velocity components.
+
+    Reflecting the position as well as the velocity keeps bounced points on the canvas,
+    so they do not bounce again on the next frame or stick outside after a speed change.
+
+    Args:
+        positions (np.ndarray): Point coordinates as (2, N) rows, updated in place.
+        velocities (np.ndarray): Point velocities as (2, N) rows, updated in place.
+        width (float): Canvas width.
+        height (float): Canvas height.
+    """
+    limits = np.array([[width], [height]], dtype=positions.dtype)
+    below = positions < 0
+    above = positions > limits
+    # Predicated negate/subtract over both rows, no fancy-indexed read/write
+    np.negative(velocities, out=velocities, where=below | above)
+    np.negative(positions, out=positions, where=below)
+    np.subtract(2 * limits, positions, out=positions, where=above)
+    # An overshoot larger than the canvas itself is clamped to the border
+    np.clip(positions, 0, limits, out=positions)
+
+@lru_cache(maxsize=4096)
 def get_color(hue, saturation, value):
     """
     Convert HSV values to RGB color.
 
+    Slider values are ints, so results are memoised and an unchanged
+    colour is returned as the same tuple without redoing the conversion.
+
     Args:
         hue (float): Hue value (0-360).
         saturation (float): Saturation value (0-100).
@@ -65,113 +107,223 @@ def get_color(hue, saturation, value):
     value = value / 100.0
     return colorsys.hsv_to_rgb(hue, saturation, value)
 
-def initialize_triangle_colors(simplices, base_color, brightness_range, triangle_colors):
+def sort_simplices(simplices):
+    """
+    Sort the vertex indices within each triangle.
+
+    A three-element sorting network of element-wise minimum/maximum passes over the
+    columns is several times faster than np.sort(axis=1) on (T, 3) arrays.
+
+    Args:
+        simplices (np.ndarray): Triangle vertex indices (T, 3).
+
+    Returns:
+        np.ndarray: int64 array (T, 3) with each row in ascending order.
+    """
+    simplices = np.asarray(simplices, dtype=np.int64).reshape(-1, 3)
+    a, b, c = simplices[:, 0], simplices[:, 1], simplices[:, 2]
+    low = np.minimum(a, b)
+    high = np.maximum(a, b)
+    middle = np.minimum(high, c)
+    return np.column_stack((np.minimum(low, middle), np.maximum(low, middle), np.maximum(high, c)))
+
+def simplex_keys(simplices, presorted=False):
+    """
+    Pack the sorted vertex indices of each triangle into a single int64 key.
+
+    Triangles with the same vertex set get the same key regardless of vertex order,
+    so the keys replace tuple(sorted(simplex)) and can be sorted and searched as int64 arrays.
+
+    Args:
+        simplices (np.ndarray): Triangle vertex indices (T, 3), each below 2**21.
+        presorted (bool): Rows are already sorted int64, e.g. the result of sort_simplices.
+
+    Returns:
+        np.ndarray: int64 keys (T,).
+    """
+    if not presorted:
+        simplices = sort_simplices(simplices)
+    return (simplices[:, 0] << 42) | (simplices[:, 1] << 21) | simplices[:, 2]
+
+def unique_edges(simplices, presorted=False):
+    """
+    Extract the unique edges of a triangulation.
+
+    Args:
+        simplices (np.ndarray): Triangle vertex indices (T, 3).
+        presorted (bool): Rows are already sorted int64, e.g. the result of sort_simplices.
+
+    Returns:
+        np.ndarray: int32 edges (E, 2) with the smaller vertex index first, sorted lexicographically.
+    """
+    if not presorted:
+        simplices = sort_simplices(simplices)
+    # Sorted rows give the three edges as column pairs; unique on packed 1-D keys is much
+    # cheaper than np.unique(axis=0) and yields the same lexicographic order
+    keys = np.unique(np.concatenate((
+        (simplices[:, 0] << 21) | simplices[:, 1],
+        (simplices[:, 1] << 21) | simplices[:, 2],
+        (simplices[:, 0] << 21) | simplices[:, 2],
+    )))
+    return np.column_stack((keys >> 21, keys & ((1 << 21) - 1))).astype(np.int32)
+
+def edge_keys(edges):
+    """
+    Pack the vertex indices of each sorted edge into a single int64 key.
+
+    Args:
+        edges (np.ndarray): Edges (E, 2) with the smaller vertex index first, each below 2**21.
+
+    Returns:
+        np.ndarray: int64 keys (E,).
+    """
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    return (edges[:, 0] << 21) | edges[:, 1]
+
+def initialize_triangle_colors(keys, base_color, brightness_range, previous_keys, previous_colors):
     """
     Initialize or update colors for triangles, varying only brightness based on base color.
 
     Args:
-        simplices (list): List of triangle simplices from Delaunay triangulation.
+        keys (np.ndarray): Packed keys of the current triangles (from simplex_keys).
         base_color (tuple): Base RGB color of points/lines (from get_color).
         brightness_range (float): Brightness range (0-100).
-        triangle_colors (dict): Existing triangle colors to preserve.
+        previous_keys (np.ndarray): Keys the previous colors were built for.
+        previous_colors (np.ndarray): Previous RGBA colors (K, 4), preserved for matching keys.
 
     Returns:
-        dict: Updated triangle colors with RGBA.
+        np.ndarray: float32 RGBA colors (T, 4), one row per key.
     """
-    brightness_range = brightness_range / 100.0
-    new_colors = {}
-    base_hsv = colorsys.rgb_to_hsv(*base_color)
-    base_hue = base_hsv[0]
-    base_saturation = base_hsv[1]
+    keys = np.asarray(keys, dtype=np.int64)
+    colors = np.empty((len(keys), 4), dtype=np.float32)
+    found = np.zeros(len(keys), dtype=bool)
+    previous_rows = np.arange(len(previous_keys))
+    if len(previous_keys) == len(keys):
+        # Edge flips rewrite only a few rows in place, so most keys match their own row;
+        # only the remaining rows are searched for colors that moved
+        found = keys == previous_keys
+        colors[found] = previous_colors[found]
+        previous_rows = np.flatnonzero(~found)
+    pending = np.flatnonzero(~found)
+    if len(pending) > 0 and len(previous_rows) > 0:
+        candidates = previous_keys[previous_rows]
+        order = np.argsort(candidates)
+        sorted_keys = candidates[order]
+        positions = np.minimum(np.searchsorted(sorted_keys, keys[pending]), len(sorted_keys) - 1)
+        hit = sorted_keys[positions] == keys[pending]
+        colors[pending[hit]] = previous_colors[previous_rows[order[positions[hit]]]]
+        found[pending[hit]] = True
 
-    for simplex in simplices:
-        simplex_key = tuple(sorted(simplex))
-        if simplex_key in triangle_colors:
-            new_colors[simplex_key] = triangle_colors[simplex_key]
-        else:
-            value = max(0.0, min(1.0, 1.0 - brightness_range + np.random.rand() * brightness_range * 2))
-            rgb = colorsys.hsv_to_rgb(base_hue, base_saturation, value)
-            new_colors[simplex_key] = rgb + (1.0,)
-    return new_colors
+    missing = np.flatnonzero(~found)
+    if len(missing) > 0:
+        colors[missing] = new_triangle_colors(len(missing), base_color, brightness_range)
+    return colors
 
-def point_in_polygon(point, polygon):
+def new_triangle_colors(count, base_color, brightness_range):
     """
-    Проверка, находится ли точка внутри полигона (Ray Casting Algorithm).
+    Generate colors for new triangles, varying only brightness based on base color.
 
     Args:
-        point (np.array): Координаты точки [x, y].
-        polygon (np.array): Массив вершин полигона [[x1, y1], [x2, y2], ...].
+        count (int): Number of triangles.
+        base_color (tuple): Base RGB color of points/lines (from get_color).
+        brightness_range (float): Brightness range (0-100).
 
     Returns:
-        bool: True, если точка внутри полигона, иначе False.
+        np.ndarray: float32 RGBA colors (count, 4).
     """
-    x, y = point
-    inside = False
-    n = len(polygon)
-    j = n - 1
-    for i in range(n):
-        if ((polygon[i][1] > y) != (polygon[j][1] > y)) and \
-           (x < (polygon[j][0] - polygon[i][0]) * (y - polygon[i][1]) / (polygon[j][1] - polygon[i][1] + 1e-10) + polygon[i][0]):
-            inside = not inside
-        j = i
-    return inside
+    brightness_range = brightness_range / 100.0
+    colors = np.empty((count, 4), dtype=np.float32)
+    colors[:, 3] = 1.0
+    values = np.clip(1.0 - brightness_range + np.random.rand(count) * brightness_range * 2, 0.0, 1.0)
+    # Hue and saturation are shared, so HSV->RGB is linear in value: scale the unit-value color
+    colors[:, :3] = values[:, np.newaxis] * _unit_value_rgb(tuple(base_color))
+    return colors
+
+@lru_cache(maxsize=16)
+def _unit_value_rgb(base_color):
+    """RGB of the base color's hue and saturation at full value, cached per base color."""
+    base_hue, base_saturation, _ = colorsys.rgb_to_hsv(*base_color)
+    return np.array(colorsys.hsv_to_rgb(base_hue, base_saturation, 1.0))
 
-def segment_intersects_polygon(p1, p2, polygon):
+def points_in_polygon(points, edge_starts, edge_ends):
     """
-    Проверка, пересекает ли отрезок [p1, p2] полигон.
+    Векторизованная проверка попадания набора точек в полигон (Ray Casting Algorithm).
+
+    Все пары (точка, ребро) проверяются одной операцией с broadcasting,
+    чётность числа пересечений луча даёт принадлежность точки полигону.
 
     Args:
-        p1 (np.array): Начальная точка отрезка [x1, y1].
-        p2 (np.array): Конечная точка отрезка [x2, y2].
-        polygon (np.array): Массив вершин полигона [[x1, y1], [x2, y2], ...].
+        points (np.array): Координаты точек (N, 2).
+        edge_starts (np.array): Начала рёбер полигона (V, 2), то есть его вершины.
+        edge_ends (np.array): Концы рёбер полигона (V, 2), то есть следующие вершины.
 
     Returns:
-        bool: True, если отрезок пересекает полигон, иначе False.
+        np.array: Булева маска (N,), True для точек внутри полигона.
     """
-    def ccw(A, B, C):
-        return (C[1] - A[1]) * (B[0] - A[0]) > (B[1] - A[1]) * (C[0] - A[0])
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    x = points[:, 0, np.newaxis]
+    y = points[:, 1, np.newaxis]
+    xi, yi = edge_ends[:, 0], edge_ends[:, 1]
+    xj, yj = edge_starts[:, 0], edge_starts[:, 1]
+    crossings = ((yi > y) != (yj > y)) & (x < (xj - xi) * (y - yi) / (yj - yi + 1e-10) + xi)
+    return np.logical_xor.reduce(crossings, axis=1)
 
-    def intersects(A, B, C, D):
-        return ccw(A, C, D) != ccw(B, C, D) and ccw(A, B, C) != ccw(A, B, D)
+def closest_points_on_polygon(points, edge_starts, edge_ends):
+    """
+    Векторизованный поиск ближайших точек на границе полигона.
 
-    for i in range(len(polygon)):
-        p3 = polygon[i]
-        p4 = polygon[(i + 1) % len(polygon)]
-        if intersects(p1, p2, p3, p4):
-            return True
-    return False
+    Args:
+        points (np.array): Координаты точек (N, 2).
+        edge_starts (np.array): Начала рёбер полигона (V, 2).
+        edge_ends (np.array): Концы рёбер полигона (V, 2).
 
-def closest_point_on_polygon(point, polygon):
+    Returns:
+        np.array: Координаты ближайших точек на границе полигона (N, 2).
     """
-    Нахождение ближайшей точки на границе полигона к данной точке.
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    p1 = edge_starts
+    v = edge_ends - edge_starts
+    w = points[:, np.newaxis, :] - p1
+    # Параметр проекции точки на каждое ребро, ограниченный концами отрезка
+    c1 = np.einsum('nvk,vk->nv', w, v)
+    c2 = np.einsum('vk,vk->v', v, v)
+    t = np.clip(np.divide(c1, c2, out=np.zeros_like(c1), where=c2 > 0), 0.0, 1.0)
+    candidates = p1 + t[:, :, np.newaxis] * v
+    distances = np.linalg.norm(points[:, np.newaxis, :] - candidates, axis=2)
+    nearest = np.argmin(distances, axis=1)
+    return candidates[np.arange(len(points)), nearest]
+
+def segments_cross_edges(starts, ends, edge_starts, edge_ends, both_directions=True):
+    """
+    Векторизованная проверка пересечения отрезков с рёбрами.
+
+    Тест знаков ориентации считается сразу для всех пар (отрезок, ребро).
+    Для вырожденных случаев (общая вершина, коллинеарность) результат зависит от
+    направления ребра, поэтому оно задаётся явно: ребро от edge_starts к edge_ends.
 
     Args:
-        point (np.array): Координаты точки [x, y].
-        polygon (np.array): Массив вершин полигона [[x1, y1], [x2, y2], ...].
+        starts (np.array): Начала отрезков (N, 2).
+        ends (np.array): Концы отрезков (N, 2).
+        edge_starts (np.array): Начала рёбер (M, 2).
+        edge_ends (np.array): Концы рёбер (M, 2).
+        both_directions (bool): Проверять ребро также в направлении от edge_ends
+            к edge_starts, как ребро полигона из двух вершин, обходимое дважды.
 
     Returns:
-        np.array: Координаты ближайшей точки на границе полигона.
-    """
-    min_dist = float('inf')
-    closest = point
-    for i in range(len(polygon)):
-        p1 = polygon[i]
-        p2 = polygon[(i + 1) % len(polygon)]
-        # Проекция точки на отрезок
-        v = p2 - p1
-        w = point - p1
-        c1 = np.dot(w, v)
-        if c1 <= 0:
-            closest_candidate = p1
-        else:
-            c2 = np.dot(v, v)
-            if c2 <= c1:
-                closest_candidate = p2
-            else:
-                t = c1 / c2
-                closest_candidate = p1 + t * v
-        dist = np.linalg.norm(point - closest_candidate)
-        if dist < min_dist:
-            min_dist = dist
-            closest = closest_candidate
-    return closest
\ No newline at end of file
+        np.array: Булева матрица (N, M), True для пересекающихся пар.
+    """
+    a = np.asarray(starts, dtype=np.float64)[:, np.newaxis, :]
+    b = np.asarray(ends, dtype=np.float64)[:, np.newaxis, :]
+    c = np.asarray(edge_starts, dtype=np.float64)[np.newaxis, :, :]
+    d = np.asarray(edge_ends, dtype=np.float64)[np.newaxis, :, :]
+
+    def ccw(p, q, r):
+        return (r[..., 1] - p[..., 1]) * (q[..., 0] - p[..., 0]) > (q[..., 1] - p[..., 1]) * (r[..., 0] - p[..., 0])
+
+    def intersects(p, q, r, s):
+        return (ccw(p, r, s) != ccw(q, r, s)) & (ccw(p, q, r) != ccw(p, q, s))
+
+    hits = intersects(a, b, c, d)
+    if both_directions:
+        hits |= intersects(a, b, d, c)
+    return hits